@@ -0,0 +1,315 @@
+// Instant client-side password scoring
+//
+// Mirrors PasswordAnalyzer.analyze_quick (basic, pattern and entropy checks)
+// so users get feedback on every keystroke. zxcvbn and breach checks stay on
+// the server, which confirms the score once typing pauses. Keep this file in
+// step with password_strength_checker/utils/password_analyzer.py; weights,
+// labels and rules come from the server's compiled policy.
+(function () {
+  'use strict';
+
+  const INPUT_ID = 'password-input';
+  const ESTIMATE_ID = 'instant-estimate';
+
+  // Character classes of utils/charclass.py: ASCII keeps its historical
+  // classes, everything else is classified by Unicode general category.
+  // Characters the policy lists as special are special and nothing else.
+  const ASCII_CLASSES = {
+    lower: /[a-z]/, upper: /[A-Z]/, digit: /\p{Nd}/u,
+    intlLower: /(?![\x00-\x7F])\p{Ll}/u,
+    intlUpper: /(?![\x00-\x7F])[\p{Lu}\p{Lt}]/u,
+    intlLetter: /[\p{Lo}\p{Lm}]/u
+  };
+
+  const FOLD = {
+    '@': 'a', '4': 'a', '8': 'b', '(': 'c', '3': 'e', '9': 'g', '6': 'g',
+    '1': 'i', '!': 'i', '|': 'i', 'l': 'i', '0': 'o', '$': 's', '5': 's',
+    '7': 't', '+': 't', '2': 'z'
+  };
+  // Python's [\d\W_]: anything but letters and non-decimal numbers
+  const AFFIXES = /^[^\p{L}\p{Nl}\p{No}]+|[^\p{L}\p{Nl}\p{No}]+$/gu;
+
+  function escapeClass(chars) {
+    // Only BMP characters are overridden by the server's lookup table
+    return Array.from(chars).filter(function (c) {
+      return c.codePointAt(0) < 0x10000;
+    }).join('').replace(/[\\\]\[^-]/g, '\\$&');
+  }
+
+  // The compiled policy is injected by the app as window.PASS_CHECKER_POLICY
+  // (CompiledPolicy.client_config), so every tenant's client estimate uses
+  // the same weights, labels and rules as its server
+  let compiled = null;
+
+  function loadPolicy() {
+    if (compiled) return compiled;
+    const policy = window.PASS_CHECKER_POLICY;
+    if (!policy) return null;
+
+    const listed = escapeClass(policy.special_characters);
+    const notListed = listed ? '(?![' + listed + '])' : '';
+    const classes = {};
+    Object.keys(ASCII_CLASSES).forEach(function (name) {
+      classes[name] = new RegExp(notListed + '(?:' + ASCII_CLASSES[name].source + ')', 'u');
+    });
+    classes.special = new RegExp(
+      (listed ? '[' + listed + ']|' : '') + notListed + '(?![\\x00-\\x7F])[\\p{P}\\p{S}]', 'u'
+    );
+
+    const patterns = [];
+    policy.patterns.forEach(function (rule) {
+      try {
+        patterns.push({
+          regex: new RegExp(rule.regex, rule.ignore_case ? 'iu' : 'u'),
+          issue: rule.issue,
+          penalty: rule.penalty
+        });
+      } catch (error) {
+        // Set client_regex in the policy when the Python syntax does not port
+        console.warn('scorer.js: skipping pattern rule', rule.issue, error);
+      }
+    });
+
+    const common = policy.common_passwords;
+    const near = policy.near_match;
+    compiled = {
+      weights: policy.weights,
+      labels: policy.strength_labels,
+      classes: classes,
+      patterns: patterns,
+      common: new Set(common.values),
+      commonPenalty: common.penalty,
+      commonIssue: common.issue,
+      near: near && {
+        penalty: near.penalty,
+        issue: near.issue,
+        maxDistance: near.max_distance,
+        minLength: near.min_length,
+        charsPerEdit: near.chars_per_edit,
+        words: common.values.map(fold).filter(function (w) {
+          return Array.from(w).length >= near.min_length;
+        })
+      }
+    };
+    return compiled;
+  }
+
+  function fold(word) {
+    return Array.from(word.toLowerCase(), function (c) { return FOLD[c] || c; }).join('');
+  }
+
+  function withinOne(a, b) {
+    if (a.length < b.length) {
+      const swap = a; a = b; b = swap;
+    }
+    if (a.length - b.length > 1) return false;
+    let i = 0;
+    while (i < b.length && a[i] === b[i]) i++;
+    if (i === b.length) return true;
+    const rest = function (arr, from) { return arr.slice(from).join(''); };
+    if (a.length !== b.length) return rest(a, i + 1) === rest(b, i);
+    return rest(a, i + 1) === rest(b, i + 1) ||
+      (a[i + 1] === b[i] && a[i] === b[i + 1] && rest(a, i + 2) === rest(b, i + 2));
+  }
+
+  // Optimal string alignment distance <= limit, as _within_distance
+  function withinDistance(a, b, limit) {
+    a = Array.from(a);
+    b = Array.from(b);
+    if (limit <= 1) return limit <= 0 ? a.join('') === b.join('') : withinOne(a, b);
+    if (Math.abs(a.length - b.length) > limit) return false;
+    let previous2 = [];
+    let previous = [];
+    for (let j = 0; j <= b.length; j++) previous.push(j);
+    for (let i = 1; i <= a.length; i++) {
+      const current = [i];
+      for (let j = 1; j <= b.length; j++) {
+        const cost = a[i - 1] === b[j - 1] ? 0 : 1;
+        current[j] = Math.min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost);
+        if (i > 1 && j > 1 && a[i - 1] === b[j - 2] && a[i - 2] === b[j - 1]) {
+          current[j] = Math.min(current[j], previous2[j - 2] + 1);
+        }
+      }
+      if (Math.min.apply(null, current) > limit) return false;
+      previous2 = previous;
+      previous = current;
+    }
+    return previous[b.length] <= limit;
+  }
+
+  // Edits tolerated for a folded word, as allowed_distance in near_match.py
+  function allowedDistance(near, word) {
+    return Math.min(near.maxDistance, Math.floor(Array.from(word).length / near.charsPerEdit));
+  }
+
+  function isNearCommon(near, password) {
+    const candidates = [fold(password)];
+    const stripped = password.replace(AFFIXES, '');
+    if (stripped && stripped !== password) candidates.push(fold(stripped));
+    return candidates.some(function (candidate) {
+      return Array.from(candidate).length >= near.minLength &&
+        near.words.some(function (word) {
+          return withinDistance(candidate, word, allowedDistance(near, word));
+        });
+    });
+  }
+
+  function classify(policy, password) {
+    const classes = {};
+    Object.keys(policy.classes).forEach(function (name) {
+      classes[name] = policy.classes[name].test(password);
+    });
+    return classes;
+  }
+
+  function isCaseless(classes) {
+    return classes.intlLetter &&
+      !(classes.lower || classes.upper || classes.intlLower || classes.intlUpper);
+  }
+
+  function basicAnalysis(classes, length) {
+    let score = 0;
+
+    if (length >= 12) {
+      score += 40;
+    } else if (length >= 8) {
+      score += 25;
+    } else {
+      score += length * 3;
+    }
+
+    const hasLowercase = classes.lower || classes.intlLower || classes.intlLetter;
+    const hasUppercase = classes.upper || classes.intlUpper;
+    const hasDigits = classes.digit;
+    const hasSpecial = classes.special;
+
+    if (hasLowercase) score += 15;
+    // Caseless scripts (CJK, Arabic, ...) are not penalized for lacking uppercase
+    if (hasUppercase || isCaseless(classes)) score += 15;
+    if (hasDigits) score += 15;
+    if (hasSpecial) score += 15;
+
+    return {
+      score: Math.min(score, 100),
+      has_uppercase: hasUppercase,
+      has_lowercase: hasLowercase,
+      has_digits: hasDigits,
+      has_special: hasSpecial
+    };
+  }
+
+  function patternAnalysis(policy, password) {
+    let score = 100;
+    const issues = [];
+
+    policy.patterns.forEach(function (rule) {
+      if (rule.regex.test(password)) {
+        score -= rule.penalty;
+        issues.push(rule.issue);
+      }
+    });
+    if (policy.common.has(password.toLowerCase())) {
+      score -= policy.commonPenalty;
+      issues.push(policy.commonIssue);
+    } else if (policy.near && isNearCommon(policy.near, password)) {
+      score -= policy.near.penalty;
+      issues.push(policy.near.issue);
+    }
+
+    return { score: Math.max(score, 0), issues: issues };
+  }
+
+  function calculateEntropy(classes, length) {
+    let charsetSize = 0;
+    if (classes.lower) charsetSize += 26;
+    if (classes.upper) charsetSize += 26;
+    if (classes.digit) charsetSize += 10;
+    if (classes.special) charsetSize += 32;
+    if (classes.intlLower) charsetSize += 32;
+    if (classes.intlUpper) charsetSize += 32;
+    if (classes.intlLetter) charsetSize += 64;
+
+    if (charsetSize === 0) return 0;
+    return length * Math.log2(charsetSize);
+  }
+
+  function strengthLabel(policy, score) {
+    for (let i = 0; i < policy.labels.length; i++) {
+      if (score >= policy.labels[i][0]) return policy.labels[i][1];
+    }
+    return policy.labels[policy.labels.length - 1][1];
+  }
+
+  // Python's round(x, 1): exact halves (only possible when x * 20 is an
+  // odd integer) go to the even neighbour; everything else as toFixed
+  function roundScore(x) {
+    const twenty = x * 20;
+    if (Number.isInteger(twenty) && twenty % 2 !== 0 && twenty / 20 === x) {
+      const tenths = Math.floor(x * 10);
+      return (tenths % 2 === 0 ? tenths : tenths + 1) / 10;
+    }
+    return Number(x.toFixed(1));
+  }
+
+  function analyzeQuick(password) {
+    const policy = loadPolicy();
+    if (!policy) return null;
+    if (!password) {
+      return { score: 0, strength: strengthLabel(policy, 0), length: 0, entropy: 0 };
+    }
+
+    // Python's len() counts code points, not UTF-16 units
+    const length = Array.from(password).length;
+    const classes = classify(policy, password);
+    const basic = basicAnalysis(classes, length);
+    const patterns = patternAnalysis(policy, password);
+    // Same weights as the server, renormalized without zxcvbn
+    const weights = policy.weights;
+    const score = (basic.score * weights.basic + patterns.score * weights.patterns) /
+      (weights.basic + weights.patterns);
+
+    return {
+      score: roundScore(score),
+      strength: strengthLabel(policy, score),
+      length: length,
+      basic: basic,
+      patterns: patterns,
+      entropy: calculateEntropy(classes, length)
+    };
+  }
+
+  function renderEstimate(password) {
+    const target = document.getElementById(ESTIMATE_ID);
+    if (!target) return;
+
+    if (!password) {
+      target.textContent = '';
+      return;
+    }
+
+    const result = analyzeQuick(password);
+    if (!result) return;
+    target.textContent =
+      'Quick estimate: ' + Math.trunc(result.score) + '% • ' +
+      result.strength + ' • ' + result.entropy.toFixed(1) + ' bits';
+  }
+
+  // Called by the server when its analysis of a password of `length` code
+  // points lands. If the input still holds that length the server result
+  // describes it, so the estimate goes; otherwise typing went on (or the
+  // value was set by script) and the estimate is recomputed for the input.
+  function settle(length) {
+    const input = document.getElementById(INPUT_ID);
+    const password = input ? input.value : '';
+    renderEstimate(Array.from(password).length === length ? '' : password);
+  }
+
+  // Delegated so it survives React re-rendering the input
+  document.addEventListener('input', function (event) {
+    if (event.target && event.target.id === INPUT_ID) {
+      renderEstimate(event.target.value);
+    }
+  });
+
+  window.PassCheckerScorer = { analyzeQuick: analyzeQuick, settle: settle };
+})();
@@ -1,29 +1,139 @@
 // Service Worker for PWA capabilities
-const CACHE_NAME = 'password-checker-v1';
-const urlsToCache = [
-  '/',
-  '/static/css/styles.css',
-  '/static/js/app.js'
+//
+// CACHE_VERSION and PRECACHE_URLS are rewritten from the exported build
+// (.web/build/client) by `python -m password_strength_checker.utils.service_worker`
+// after `reflex export`; the values below are the development defaults.
+const CACHE_VERSION = 'dev';
+const PRECACHE_URLS = [
+  '/'
 ];
 
+const CACHE_PREFIX = 'password-checker-';
+const PRECACHE_NAME = CACHE_PREFIX + 'precache-' + CACHE_VERSION;
+const RUNTIME_NAME = CACHE_PREFIX + 'runtime-' + CACHE_VERSION;
+
+// Reflex backend endpoints: state events, uploads and health checks must
+// always reach the server
+const BACKEND_PATHS = ['/_event', '/_upload', '/ping', '/_health'];
+
+// Vite's build.assetsDir: file names carry a content hash, so a cached copy
+// never goes stale
+const HASHED_ASSETS_PATH = '/assets/';
+
 self.addEventListener('install', function(event) {
   event.waitUntil(
-    caches.open(CACHE_NAME)
+    caches.open(PRECACHE_NAME)
       .then(function(cache) {
-        return cache.addAll(urlsToCache);
+        return cache.addAll(PRECACHE_URLS);
+      })
+      .then(function() {
+        return self.skipWaiting();
       })
   );
 });
 
-self.addEventListener('fetch', function(event) {
-  event.respondWith(
-    caches.match(event.request)
-      .then(function(response) {
-        if (response) {
+self.addEventListener('activate', function(event) {
+  event.waitUntil(
+    caches.keys()
+      .then(function(names) {
+        return Promise.all(names
+          .filter(function(name) {
+            return name.startsWith(CACHE_PREFIX) &&
+              name !== PRECACHE_NAME && name !== RUNTIME_NAME;
+          })
+          .map(function(name) {
+            return caches.delete(name);
+          }));
+      })
+      .then(function() {
+        return self.clients.claim();
+      })
+  );
+});
+
+function isBackendRequest(url) {
+  return BACKEND_PATHS.some(function(path) {
+    return url.pathname === path || url.pathname.startsWith(path + '/');
+  });
+}
+
+// Hashed build output never changes under the same URL
+function cacheFirst(request) {
+  return caches.match(request).then(function(cached) {
+    if (cached) {
+      return cached;
+    }
+    return fetch(request).then(function(response) {
+      if (response.ok) {
+        const copy = response.clone();
+        caches.open(RUNTIME_NAME).then(function(cache) {
+          cache.put(request, copy);
+        });
+      }
+      return response;
+    });
+  });
+}
+
+// Pages should pick up new deployments, falling back to the cache offline
+function networkFirst(request) {
+  return fetch(request)
+    .then(function(response) {
+      if (response.ok) {
+        const copy = response.clone();
+        caches.open(RUNTIME_NAME).then(function(cache) {
+          cache.put(request, copy);
+        });
+      }
+      return response;
+    })
+    .catch(function() {
+      return caches.match(request).then(function(cached) {
+        return cached || caches.match('/');
+      });
+    });
+}
+
+// Unhashed assets (CSS, fonts, scripts) are served from cache and refreshed
+// in the background for the next visit
+function staleWhileRevalidate(request, event) {
+  return caches.open(RUNTIME_NAME).then(function(cache) {
+    return cache.match(request).then(function(cached) {
+      const network = fetch(request)
+        .then(function(response) {
+          if (response.ok) {
+            cache.put(request, response.clone());
+          }
           return response;
-        }
-        return fetch(event.request);
+        })
+        .catch(function() {
+          return cached;
+        });
+      if (cached) {
+        event.waitUntil(network);
+        return cached;
       }
-    )
-  );
-});
\ No newline at end of file
+      return network;
+    });
+  });
+}
+
+self.addEventListener('fetch', function(event) {
+  const request = event.request;
+  if (request.method !== 'GET') {
+    return;
+  }
+
+  const url = new URL(request.url);
+  if (url.origin !== self.location.origin || isBackendRequest(url)) {
+    return;
+  }
+
+  if (request.mode === 'navigate') {
+    event.respondWith(networkFirst(request));
+  } else if (url.pathname.startsWith(HASHED_ASSETS_PATH)) {
+    event.respondWith(cacheFirst(request));
+  } else {
+    event.respondWith(staleWhileRevalidate(request, event));
+  }
+});
@@ -0,0 +1,141 @@
+"""Reproducible synthetic password corpora for benchmarks and load tests
+
+Every corpus is a pure function of its seed and distributions, built with
+a seeded `random.Random` (never `secrets`), so runs on different machines
+see identical data. Not for generating real passwords.
+
+    python -m benchmarks.corpus --size 100000 --seed 7 > corpus.txt
+"""
+import argparse
+import random
+import string
+import sys
+from typing import Dict, Iterator, List, Optional, Sequence
+
+from password_strength_checker.utils.password_analyzer import PasswordGenerator
+from password_strength_checker.utils.policy import load_policy
+
+# Share of each kind of password. "random" is generator output with a random
+# subset of character classes; the rest exercise the pattern and dictionary
+# checks the way real passwords do.
+DEFAULT_KINDS = {
+    "random": 0.45,
+    "word": 0.20,
+    "leet": 0.15,
+    "sequence": 0.10,
+    "repeat": 0.10,
+}
+
+# Requested length -> weight, used for "random" passwords
+DEFAULT_LENGTHS = {6: 1, 8: 4, 10: 4, 12: 5, 14: 3, 16: 3, 20: 1, 32: 0.5}
+
+# Probability that each character class is enabled for a "random" password
+DEFAULT_CLASSES = {"lowercase": 0.95, "uppercase": 0.7, "digits": 0.8, "special": 0.5}
+
+_LEET = {"a": "@4", "e": "3", "i": "1!", "o": "0", "s": "$5", "t": "7"}
+_SEQUENCES = ("0123456789", string.ascii_lowercase, "qwertyuiop", "asdfghjkl")
+_AFFIXES = ("", "", "1", "12", "123", "!", "2024", "#1", "99")
+
+
+class SyntheticCorpus:
+    """Seeded password stream with controlled length, class and pattern mix"""
+
+    def __init__(self, seed: int = 0, kinds: Optional[Dict[str, float]] = None,
+                 lengths: Optional[Dict[int, float]] = None,
+                 classes: Optional[Dict[str, float]] = None,
+                 words: Optional[Sequence[str]] = None):
+        self.rng = random.Random(seed)
+        self.generator = PasswordGenerator(self.rng)
+        kinds = kinds or DEFAULT_KINDS
+        unknown = set(kinds) - set(DEFAULT_KINDS)
+        if unknown:
+            raise ValueError(f"Unknown password kinds {sorted(unknown)}, expected {sorted(DEFAULT_KINDS)}")
+        self._kinds = list(kinds)
+        self._kind_weights = list(kinds.values())
+        lengths = lengths or DEFAULT_LENGTHS
+        self._lengths = list(lengths)
+        self._length_weights = list(lengths.values())
+        self.classes = classes or DEFAULT_CLASSES
+        self.words = sorted(words or load_policy().common_passwords)
+
+    def _random(self) -> str:
+        rng = self.rng
+        enabled = {name: rng.random() < p for name, p in self.classes.items()}
+        if not any(enabled.values()):
+            enabled["lowercase"] = True
+        length = rng.choices(self._lengths, self._length_weights)[0]
+        password = self.generator.generate(
+            length=length,
+            use_lowercase=enabled.get("lowercase", False),
+            use_uppercase=enabled.get("uppercase", False),
+            use_digits=enabled.get("digits", False),
+            use_special=enabled.get("special", False),
+            exclude_ambiguous=False,
+        )
+        # The generator never goes below its minimum; truncate to reach short lengths
+        return password[:length]
+
+    def _word(self) -> str:
+        rng = self.rng
+        word = rng.choice(self.words)
+        if rng.random() < 0.5:
+            word = word.capitalize()
+        return word + rng.choice(_AFFIXES)
+
+    def _leet(self) -> str:
+        rng = self.rng
+        word = rng.choice(self.words)
+        return "".join(
+            rng.choice(_LEET[c]) if c in _LEET and rng.random() < 0.6 else c for c in word
+        ) + rng.choice(_AFFIXES)
+
+    def _sequence(self) -> str:
+        rng = self.rng
+        source = rng.choice(_SEQUENCES)
+        start = rng.randrange(len(source) - 3)
+        run = source[start:start + rng.randint(3, len(source) - start)]
+        return rng.choice(self.words)[:4] + run if rng.random() < 0.5 else run + rng.choice(_AFFIXES)
+
+    def _repeat(self) -> str:
+        rng = self.rng
+        char = rng.choice(string.ascii_letters + string.digits + "!@#")
+        return rng.choice(self.words)[:5] + char * rng.randint(3, 6)
+
+    def __iter__(self) -> Iterator[str]:
+        makers = {kind: getattr(self, f"_{kind}") for kind in self._kinds}
+        rng = self.rng
+        while True:
+            # Draw kinds in blocks to keep the weighted choice off the hot path
+            for kind in rng.choices(self._kinds, self._kind_weights, k=1024):
+                yield makers[kind]()
+
+    def take(self, count: int) -> List[str]:
+        iterator = iter(self)
+        return [next(iterator) for _ in range(count)]
+
+
+def build_corpus(size: int, unique: int, seed: int) -> List[str]:
+    """`size` passwords drawn with a Zipf-like skew from `unique` distinct ones"""
+    corpus = SyntheticCorpus(seed)
+    pool = list(dict.fromkeys(corpus.take(unique)))
+    weights = [1 / (rank + 1) for rank in range(len(pool))]
+    return corpus.rng.choices(pool, weights=weights, k=size)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size", type=int, default=10000)
+    parser.add_argument("--unique", type=int, default=0,
+                        help="draw from this many distinct passwords with a Zipf skew")
+    parser.add_argument("--seed", type=int, default=1234)
+    args = parser.parse_args()
+
+    if args.unique:
+        passwords = build_corpus(args.size, args.unique, args.seed)
+    else:
+        passwords = SyntheticCorpus(args.seed).take(args.size)
+    sys.stdout.write("\n".join(passwords) + "\n")
+
+
+if __name__ == "__main__":
+    main()
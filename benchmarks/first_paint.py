@@ -0,0 +1,125 @@
+"""First paint and font loading of the app in a cold headless browser
+
+Loads each URL --runs times, every time in a fresh browser context (empty
+HTTP cache, no service worker), optionally on a throttled network, and
+reports medians of first paint, first contentful paint, the moment the
+last font file arrived, and the font files requested, with their bytes
+and any failed (e.g. 404) responses. Pass two URLs to compare builds,
+e.g. the Google Fonts baseline against the self-hosted subsets:
+
+    reflex export --frontend-only --no-zip && python -m http.server -d .web/build/client 3000 &
+    python -m benchmarks.first_paint http://localhost:3000/ http://baseline:3000/ --network 4g
+
+Requires `pip install playwright && playwright install chromium`, or an
+existing Chrome/Chromium passed with --browser.
+"""
+import argparse
+import asyncio
+import statistics
+from typing import Dict, List
+
+# Download/upload in bytes per second and round-trip latency in ms, as the
+# Chrome DevTools presets
+NETWORKS = {
+    "none": None,
+    "4g": (4 * 1024 * 1024 / 8, 3 * 1024 * 1024 / 8, 20),
+    "fast-3g": (1.6 * 1024 * 1024 / 8, 750 * 1024 / 8, 150),
+    "slow-3g": (500 * 1024 / 8, 500 * 1024 / 8, 400),
+}
+
+# Paint entries may not exist yet at the load event, so wait for the first
+# contentful paint (or give up after 10 s) and for any font loads to settle
+_PAINT_TIMINGS = """
+() => new Promise(resolve => {
+  let done = false;
+  const finish = () => {
+    if (done) return;
+    done = true;
+    document.fonts.ready.then(() => {
+      const paints = {};
+      performance.getEntriesByType('paint').forEach(e => { paints[e.name] = e.startTime; });
+      const fonts = performance.getEntriesByType('resource')
+        .filter(e => /\\.(woff2?|ttf)(\\?|$)/.test(e.name))
+        .map(e => e.responseEnd);
+      resolve({
+        firstPaint: paints['first-paint'] || null,
+        firstContentfulPaint: paints['first-contentful-paint'] || null,
+        fontsLoaded: fonts.length ? Math.max(...fonts) : null
+      });
+    });
+  };
+  new PerformanceObserver(list => {
+    if (list.getEntriesByName('first-contentful-paint').length) finish();
+  }).observe({type: 'paint', buffered: true});
+  setTimeout(finish, 10000);
+})
+"""
+
+
+async def measure(browser, url: str, network: str) -> Dict:
+    """One cold page load"""
+    context = await browser.new_context(service_workers="block")
+    page = await context.new_page()
+    fonts: List[Dict] = []
+
+    async def on_response(response):
+        request = response.request
+        if request.resource_type == "font" or request.url.endswith((".woff2", ".woff", ".ttf")):
+            body = await response.body() if response.ok else b""
+            fonts.append({"url": request.url, "status": response.status, "bytes": len(body)})
+
+    page.on("response", lambda response: asyncio.ensure_future(on_response(response)))
+    conditions = NETWORKS[network]
+    if conditions:
+        cdp = await context.new_cdp_session(page)
+        download, upload, latency = conditions
+        await cdp.send("Network.emulateNetworkConditions", {
+            "offline": False, "latency": latency,
+            "downloadThroughput": download, "uploadThroughput": upload,
+        })
+
+    await page.goto(url, wait_until="load")
+    timings = await page.evaluate(_PAINT_TIMINGS)
+    await page.wait_for_load_state("networkidle")
+    await context.close()
+    timings["fonts"] = fonts
+    return timings
+
+
+def _median(runs: List[Dict], key: str):
+    values = [run[key] for run in runs if run[key] is not None]
+    return statistics.median(values) if values else None
+
+
+async def run(args) -> None:
+    from playwright.async_api import async_playwright
+
+    async with async_playwright() as playwright:
+        browser = await playwright.chromium.launch(executable_path=args.browser or None)
+        for url in args.urls:
+            runs = [await measure(browser, url, args.network) for _ in range(args.runs)]
+            last = runs[-1]["fonts"]
+            failed = [font for font in last if font["status"] >= 400]
+            print(url)
+            for key, label in (("firstPaint", "first paint"),
+                               ("firstContentfulPaint", "first contentful paint"),
+                               ("fontsLoaded", "fonts loaded")):
+                value = _median(runs, key)
+                print(f"  {label:<24} {value:8.1f} ms" if value is not None else f"  {label:<24}      n/a")
+            print(f"  {'font requests':<24} {len(last):8d}  ({sum(f['bytes'] for f in last)} bytes)")
+            for font in failed:
+                print(f"  failed {font['status']}: {font['url']}")
+        await browser.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("urls", nargs="+", help="pages to compare")
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--network", choices=sorted(NETWORKS), default="none")
+    parser.add_argument("--browser", default="", help="Chrome/Chromium executable instead of Playwright's")
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,327 @@
+"""Load test State.analyze_password through the real Reflex websocket path
+
+Simulates N browser sessions. Each one connects to the backend's socket.io
+endpoint, hydrates, and types passwords one keystroke at a time at human
+speed. Like the frontend, each session sends one event at a time and queues
+keystrokes typed while a response is outstanding. Reports event round-trip
+latency percentiles (measured from the keystroke, so queueing counts),
+dropped events, delta bytes per event, which analysis tier served the
+results and, given --backend-pid, backend CPU and memory.
+
+    reflex run --env prod &
+    python -m benchmarks.loadtest --sessions 50 --duration 60 --backend-pid <pid>
+
+Every session connects from this host, so by default they all share one
+per-IP bucket and most results come from the quick tier. To model distinct
+clients, start the backend with PASS_CHECKER_TRUSTED_PROXIES=1 and pass
+--distinct-ips, which sends each session from its own X-Forwarded-For.
+
+Requires python-socketio and psutil, which ship as Reflex dependencies.
+"""
+import argparse
+import asyncio
+import json
+import random
+import statistics
+import time
+import uuid
+from collections import Counter
+from typing import Dict, List, Optional
+
+import psutil
+import socketio
+
+from benchmarks.corpus import build_corpus
+
+ROUTER_DATA = {"pathname": "/", "query": {}, "asPath": "/"}
+
+# Reflex serves socket.io at /_event and handles events in a namespace of the same name
+EVENT_PATH = "/_event"
+
+
+def default_handler_names() -> Dict[str, str]:
+    """Fully qualified event names as the compiled frontend would send them"""
+    import reflex as rx
+    from password_strength_checker.password_strength_checker import State
+
+    return {
+        "hydrate": f"{rx.State.get_full_name()}.hydrate",
+        "analyze": f"{State.get_full_name()}.analyze_password",
+    }
+
+
+def is_final(update: Dict) -> bool:
+    """Whether an update is the last one of an analyze_password event
+
+    Reflex 0.10 no longer marks the final update, and the handler's delta
+    is followed by the call that clears the instant estimate.
+    """
+    if "final" in update:
+        return update["final"]
+    return any(event.get("name") == "_call_script" for event in update.get("events", []))
+
+
+class Stats:
+    def __init__(self):
+        self.latencies: List[float] = []
+        self.delta_bytes: List[int] = []
+        self.tiers: Counter = Counter()
+        self.sent = 0
+        self.dropped = 0
+        self.late_updates = 0
+        self.failed_sessions = 0
+        self.desynced_sessions = 0
+
+    def percentile(self, pct: float) -> float:
+        ordered = sorted(self.latencies)
+        index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+        return ordered[index]
+
+
+class SessionDesynced(Exception):
+    """A timed-out event never finished, so updates can no longer be matched"""
+
+
+class Session:
+    """One simulated browser tab
+
+    Updates carry no id of the event they answer, so like the frontend a
+    session only sends its next event once the previous one has finished.
+    An event that times out is counted as dropped, and its late updates are
+    consumed before the next event is sent rather than credited to it.
+    """
+
+    def __init__(self, args, handlers: Dict[str, str], passwords: List[str],
+                 stats: Stats, rng: random.Random, index: int = 0):
+        self.args = args
+        self.index = index
+        self.handlers = handlers
+        self.passwords = passwords
+        self.stats = stats
+        self.rng = rng
+        self.token = str(uuid.uuid4())
+        self.client = socketio.AsyncClient(reconnection=False)
+        self.updates: asyncio.Queue = asyncio.Queue()
+        self.client.on("event", self._on_update, namespace=EVENT_PATH)
+        # Set when an event timed out before its final update arrived
+        self._outstanding = False
+        self._desynced = False
+        # Deltas only carry changed vars, so remember the last tier seen
+        self.tier = ""
+
+    async def _on_update(self, data):
+        # Depending on the Reflex version updates arrive as JSON text or dicts
+        raw = data if isinstance(data, str) else json.dumps(data)
+        update = json.loads(raw)
+        for fields in update.get("delta", {}).values():
+            for name, value in fields.items():
+                if name.startswith("analysis_tier"):
+                    self.tier = value
+        await self.updates.put((update, len(raw.encode("utf-8"))))
+
+    async def _next_update(self, deadline: float):
+        remaining = deadline - time.perf_counter()
+        if remaining <= 0:
+            raise asyncio.TimeoutError
+        return await asyncio.wait_for(self.updates.get(), remaining)
+
+    async def _discard_late_updates(self):
+        """Consume the rest of a timed-out event, up to its final update"""
+        deadline = time.perf_counter() + self.args.timeout
+        while True:
+            try:
+                update, _ = await self._next_update(deadline)
+            except asyncio.TimeoutError:
+                raise SessionDesynced from None
+            self.stats.late_updates += 1
+            if is_final(update):
+                self._outstanding = False
+                return
+
+    async def _send(self, name: str, payload: Dict, queued_at: float, record: bool = True) -> bool:
+        """Emit one event and wait for its final update
+
+        Events sent with `record=False` (the hydrate, whose reply carries
+        the whole initial state) are left out of latencies and delta bytes;
+        its single update is taken as final.
+        """
+        if self._outstanding:
+            await self._discard_late_updates()
+        event = {"name": name, "payload": payload, "token": self.token, "router_data": ROUTER_DATA}
+        self.stats.sent += 1
+        await self.client.emit("event", event, namespace=EVENT_PATH)
+
+        size = 0
+        deadline = time.perf_counter() + self.args.timeout
+        while True:
+            try:
+                update, nbytes = await self._next_update(deadline)
+            except asyncio.TimeoutError:
+                self.stats.dropped += 1
+                self._outstanding = True
+                return False
+            size += nbytes
+            if not record:
+                return True
+            if is_final(update):
+                self.stats.latencies.append(time.perf_counter() - queued_at)
+                self.stats.delta_bytes.append(size)
+                self.stats.tiers[self.tier or "none"] += 1
+                return True
+
+    def _keystroke_delay(self) -> float:
+        # Inter-key intervals of typists cluster around 150-250 ms
+        return max(0.03, self.rng.gauss(self.args.keystroke_ms, self.args.keystroke_ms / 3) / 1000)
+
+    async def _type(self, password: str, queue: asyncio.Queue):
+        """Produce analyze events the way the (debounced) input would"""
+        debounce = self.args.debounce_ms / 1000
+        for i in range(1, len(password) + 1):
+            delay = self._keystroke_delay()
+            last = i == len(password)
+            if last or delay >= debounce:
+                await queue.put((password[:i], time.perf_counter()))
+            await asyncio.sleep(delay)
+
+    async def run(self, stop_at: float):
+        try:
+            # The backend links the socket to the session through the token
+            # query parameter, as the frontend's socket does
+            headers = {}
+            if self.args.distinct_ips:
+                # 198.18.0.0/15 is reserved for benchmarking
+                headers["X-Forwarded-For"] = f"198.18.{self.index // 256}.{self.index % 256}"
+            await self.client.connect(
+                f"{self.args.url}?token={self.token}", headers=headers, socketio_path=EVENT_PATH,
+                namespaces=[EVENT_PATH], transports=["websocket"]
+            )
+        except Exception:
+            self.stats.failed_sessions += 1
+            return
+
+        try:
+            await self._send(self.handlers["hydrate"], {}, time.perf_counter(), record=False)
+            queue: asyncio.Queue = asyncio.Queue()
+            sender = asyncio.create_task(self._drain(queue))
+            while time.perf_counter() < stop_at and not self._desynced:
+                await self._type(self.rng.choice(self.passwords), queue)
+                await asyncio.sleep(self.args.think_ms / 1000)
+            await queue.join()
+            sender.cancel()
+        finally:
+            await self.client.disconnect()
+
+    async def _drain(self, queue: asyncio.Queue):
+        while True:
+            prefix, queued_at = await queue.get()
+            try:
+                if not self._desynced:
+                    await self._send(self.handlers["analyze"], {"password": prefix}, queued_at)
+            except SessionDesynced:
+                # Later latencies would be meaningless; stop this session
+                self._desynced = True
+                self.stats.desynced_sessions += 1
+            finally:
+                queue.task_done()
+
+
+async def sample_backend(pid: int, stop_at: float, interval: float) -> Dict[str, float]:
+    """Sample CPU and RSS of the backend process and its workers"""
+    root = psutil.Process(pid)
+    cpu: List[float] = []
+    rss: List[int] = []
+    processes = {}
+    while time.perf_counter() < stop_at:
+        try:
+            for proc in [root] + root.children(recursive=True):
+                if proc.pid not in processes:
+                    processes[proc.pid] = proc
+                    proc.cpu_percent(None)
+            cpu.append(sum(p.cpu_percent(None) for p in processes.values() if p.is_running()))
+            rss.append(sum(p.memory_info().rss for p in processes.values() if p.is_running()))
+        except psutil.NoSuchProcess:
+            pass
+        await asyncio.sleep(interval)
+    if not cpu:
+        return {}
+    return {
+        "cpu_avg_pct": statistics.mean(cpu[1:] or cpu),
+        "cpu_max_pct": max(cpu),
+        "rss_max_mb": max(rss) / 2 ** 20,
+    }
+
+
+async def run_load(args) -> Dict:
+    if args.hydrate_event and args.analyze_event:
+        handlers = {"hydrate": args.hydrate_event, "analyze": args.analyze_event}
+    else:
+        handlers = default_handler_names()
+        handlers.update({k: v for k, v in (("hydrate", args.hydrate_event), ("analyze", args.analyze_event)) if v})
+    passwords = build_corpus(args.corpus_size, args.corpus_size, args.seed)
+    stats = Stats()
+    stop_at = time.perf_counter() + args.duration
+
+    sampler: Optional[asyncio.Task] = None
+    if args.backend_pid:
+        sampler = asyncio.create_task(sample_backend(args.backend_pid, stop_at, 0.5))
+
+    sessions = []
+    for i in range(args.sessions):
+        session = Session(args, handlers, passwords, stats, random.Random(args.seed + i), i)
+        sessions.append(asyncio.create_task(session.run(stop_at)))
+        # Stagger connections so they do not all hydrate at once
+        await asyncio.sleep(args.ramp_up / max(args.sessions, 1))
+    await asyncio.gather(*sessions)
+    resources = await sampler if sampler else {}
+
+    report = {
+        "sessions": args.sessions,
+        "failed_sessions": stats.failed_sessions,
+        "events_sent": stats.sent,
+        "events_dropped": stats.dropped,
+        "late_updates": stats.late_updates,
+        "desynced_sessions": stats.desynced_sessions,
+        "events_per_s": len(stats.latencies) / args.duration,
+    }
+    if stats.latencies:
+        report.update({
+            f"latency_p{pct}_ms": stats.percentile(pct) * 1000 for pct in (50, 90, 95, 99)
+        })
+        report["latency_max_ms"] = max(stats.latencies) * 1000
+        report["delta_bytes_avg"] = statistics.mean(stats.delta_bytes)
+        report.update({f"tier_{tier}": count for tier, count in sorted(stats.tiers.items())})
+    report.update(resources)
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--url", default="http://localhost:9000")
+    parser.add_argument("--sessions", type=int, default=20)
+    parser.add_argument("--duration", type=float, default=30.0, help="seconds")
+    parser.add_argument("--ramp-up", type=float, default=5.0, help="seconds to connect all sessions")
+    parser.add_argument("--keystroke-ms", type=float, default=200.0, help="mean inter-key interval")
+    parser.add_argument("--debounce-ms", type=float, default=300.0,
+                        help="frontend input debounce; 0 sends every keystroke")
+    parser.add_argument("--think-ms", type=float, default=1500.0, help="pause between passwords")
+    parser.add_argument("--timeout", type=float, default=10.0, help="seconds before an event counts as dropped")
+    parser.add_argument("--distinct-ips", action="store_true",
+                        help="give each session its own X-Forwarded-For (needs a backend that trusts it)")
+    parser.add_argument("--backend-pid", type=int, default=0)
+    parser.add_argument("--corpus-size", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=1234)
+    parser.add_argument("--hydrate-event", default="", help="override the hydrate event name")
+    parser.add_argument("--analyze-event", default="", help="override the analyze event name")
+    parser.add_argument("--json", default="", help="also write the report to this file")
+    args = parser.parse_args()
+
+    report = asyncio.run(run_load(args))
+    for key, value in report.items():
+        print(f"{key:<18} {value:.1f}" if isinstance(value, float) else f"{key:<18} {value}")
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""Analysis throughput as backend workers are added
+
+Each worker process stands in for one backend worker: it owns a
+PasswordAnalyzer and a ResultCache (shared through Redis when REDIS_URL is
+set, in-process otherwise) and analyzes a slice of a corpus in which popular
+passwords repeat, as they do in real traffic. The corpus comes from
+benchmarks.corpus, so the same seed gives the same passwords on every run.
+
+The clock starts only once every worker has built and warmed up its
+analyzer, so process start-up is not counted against larger pools. Worker
+counts above the machine's CPU count cannot scale and are flagged. Without
+Redis each worker has a private cache, so more workers also means fewer
+hits; the hit rate is printed next to each run.
+
+    python -m benchmarks.throughput --workers 1 2 4 8
+    REDIS_URL=redis://localhost:6379/0 python -m benchmarks.throughput
+"""
+import argparse
+import os
+import secrets
+import time
+import multiprocessing
+from multiprocessing import Pool
+from typing import List, Tuple
+
+from benchmarks.corpus import build_corpus
+from password_strength_checker.utils.digest import DIGEST_KEY_ENV
+from password_strength_checker.utils.password_analyzer import PasswordAnalyzer
+from password_strength_checker.utils.result_cache import ResultCache
+
+_analyzer = None
+_cache = None
+
+
+def _init_worker(namespace: str, ready):
+    global _analyzer, _cache
+    _analyzer = PasswordAnalyzer()
+    _cache = ResultCache.from_env(namespace=namespace)
+    # Warm up the policy, character table and zxcvbn dictionaries
+    _analyzer.analyze_comprehensive("warm-up password 1!")
+    ready.wait()
+
+
+def _analyze_chunk(chunk: List[str]) -> Tuple[int, int]:
+    hits = 0
+    for password in chunk:
+        if _cache.get(password) is not None:
+            hits += 1
+        else:
+            _cache.set(password, _analyzer.analyze_comprehensive(password))
+    return len(chunk), hits
+
+
+def run(corpus: List[str], workers: int, chunk_size: int) -> Tuple[float, float]:
+    """Analyze the corpus with `workers` processes; passwords/second and hit rate"""
+    # A fresh namespace per run so each worker count starts with a cold cache
+    namespace = f"bench-{secrets.token_hex(4)}"
+    chunks = [corpus[i:i + chunk_size] for i in range(0, len(corpus), chunk_size)]
+    ready = multiprocessing.Barrier(workers + 1)
+
+    with Pool(workers, initializer=_init_worker, initargs=(namespace, ready)) as pool:
+        ready.wait()
+        start = time.perf_counter()
+        done = hits = 0
+        for analyzed, cached in pool.imap_unordered(_analyze_chunk, chunks):
+            done += analyzed
+            hits += cached
+        elapsed = time.perf_counter() - start
+    return done / elapsed, hits / done
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--size", type=int, default=20000)
+    parser.add_argument("--unique", type=int, default=5000)
+    parser.add_argument("--chunk-size", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=1234)
+    args = parser.parse_args()
+
+    # Workers only share cache entries when they derive the same digests
+    os.environ.setdefault(DIGEST_KEY_ENV, secrets.token_hex(32))
+    backend = "redis" if os.environ.get("REDIS_URL") else "in-process"
+    corpus = build_corpus(args.size, args.unique, args.seed)
+
+    cpus = os.cpu_count() or 1
+    print(f"{len(corpus)} passwords, {args.unique} unique, {backend} cache, {cpus} CPUs")
+    baseline = None
+    for workers in args.workers:
+        rate, hit_rate = run(corpus, workers, args.chunk_size)
+        baseline = baseline or rate
+        note = "  (more workers than CPUs)" if workers > cpus else ""
+        print(f"workers={workers:<3} {rate:>10.0f} passwords/s  x{rate / baseline:.2f}"
+              f"  hits {hit_rate:.0%}{note}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,59 @@
+import asyncio
+import json
+from concurrent.futures import ThreadPoolExecutor
+
 import reflex as rx
-from .utils.password_analyzer import PasswordAnalyzer, PasswordGenerator
+from .utils.fonts import preload_urls
+from .utils.password_analyzer import MIN_GENERATED_LENGTH, PasswordAnalyzer, PasswordGenerator
+from .utils.rate_limit import AdmissionController, client_ip
+from .utils.result_cache import ResultCache
+
+# Element ids shared with assets/scorer.js
+PASSWORD_INPUT_ID = "password-input"
+INSTANT_ESTIMATE_ID = "instant-estimate"
+
+# Server-side analysis (zxcvbn, breach check) waits for a pause in typing;
+# assets/scorer.js gives instant feedback in the meantime
+ANALYSIS_DEBOUNCE_MS = 300
+
+# The analyzer holds no per-request state, so one instance serves every session
+_analyzer = PasswordAnalyzer()
+# Index the near-match wordlist while the worker starts, not on the first
+# keystroke inside an event handler (see CompiledPolicy.build_near_index)
+_analyzer.policy.build_near_index()
+
+# Per-session and per-IP token buckets plus a global cap on concurrent
+# zxcvbn runs; requests over the limit get the cheap analysis tier. Limits
+# and the number of trusted proxies come from the environment (see LIMIT_ENV)
+_admission = AdmissionController.from_env()
+
+# Admitted zxcvbn runs happen here rather than on the event loop, so one slow
+# analysis does not stall every other session on this worker. One thread per
+# admission slot: the cap is what bounds the work in flight. The GIL still
+# serializes the Python itself; more CPUs means more backend workers.
+_analysis_pool = ThreadPoolExecutor(
+    max_workers=_admission.max_concurrent, thread_name_prefix="analysis"
+)
+
+# Shared across workers and nodes through Redis when REDIS_URL is set;
+# namespaced by policy so nodes running different policies never mix results
+_results = ResultCache.from_env(namespace=_analyzer.policy.fingerprint)
+# Redis calls block for up to the socket timeout, so they run here instead of
+# on the event loop; stores are not awaited
+_cache_pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix="result-cache")
+
+def _settle_estimate(password: str):
+    """Clear the instant estimate once the server result for `password` lands
+
+    Only the length goes back to the browser, never the password.
+    """
+    return rx.call_script(
+        f"window.PassCheckerScorer && window.PassCheckerScorer.settle({len(password)})"
+    )
 
 class State(rx.State):
     """Enhanced application state"""
-    password: str = ""
+    has_password: bool = False
     score: int = 0
     strength: str = "Very Weak"
     feedback: list = []
@@ -23,28 +73,39 @@ class State(rx.State):
     crack_time: str = ""
     patterns_found: list = []
     nist_compliant: bool = False
+    # Which tier served the result: "full", "quick" (over the rate limit or
+    # the concurrency cap) or "cached"
+    analysis_tier: str = ""
     
     # History
     password_history: list[dict] = []
     password_count: int = 0
     
-    def analyze_password(self, password: str):
-        """Enhanced password analysis"""
-        self.password = password
+    async def analyze_password(self, password: str):
+        """Enhanced password analysis
+        
+        The input is uncontrolled, so the plaintext is never stored on the
+        state or echoed back to the client. Result fields are only assigned
+        when their value changes, which keeps them out of the websocket delta.
+        """
+        self._update_fields(has_password=bool(password))
         
         if password:
-            analyzer = PasswordAnalyzer()
-            analysis = analyzer.analyze_comprehensive(password)
+            analysis, tier = await self._run_analysis(password)
             
-            self.score = int(analysis.get("score", 0))
-            self.strength = analysis.get("strength", "Very Weak")
-            self.feedback = analysis.get("feedback", [])            
-            self.entropy = analysis.get("entropy", 0.0)
-            self.crack_time = analysis.get("zxcvbn", {}).get("crack_time", "Unknown")
-            self.patterns_found = analysis.get("patterns", {}).get("issues", [])
-            self.nist_compliant = self._check_nist_compliance(password)
+            self._update_fields(
+                analysis_tier=tier,
+                score=int(analysis.get("score", 0)),
+                strength=analysis.get("strength", "Very Weak"),
+                feedback=analysis.get("feedback", []),
+                entropy=analysis.get("entropy", 0.0),
+                crack_time=analysis.get("zxcvbn", {}).get("crack_time", "Unknown"),
+                patterns_found=analysis.get("patterns", {}).get("issues", []),
+                nist_compliant=self._check_nist_compliance(password)
+            )
             
-            # Add to history (last 10 analyses)
+            # Add to history (last 10 analyses). A changed list is sent whole,
+            # so this is most of each keystroke's delta (~700 of ~1100 bytes).
             self.password_count += 1
             if len(self.password_history) >= 10:
                 self.password_history.pop(0)
@@ -54,10 +115,43 @@ class State(rx.State):
                 "length": len(password),
                 "timestamp": f"Password {self.password_count}"
             })
+            return _settle_estimate(password)
         else:
             self._reset_analysis()
     
-    def generate_password(self):
+    async def _run_analysis(self, password: str) -> tuple[dict, str]:
+        """Return the analysis and the tier that produced it"""
+        # A Redis outage makes this a miss (see ResultCache), never an error
+        loop = asyncio.get_running_loop()
+        if _results.blocking:
+            cached = await loop.run_in_executor(_cache_pool, _results.get, password)
+        else:
+            cached = _results.get(password)
+        if cached is not None:
+            return cached, "cached"
+        
+        if not _admission.try_acquire(self.router.session.client_token, self._client_ip()):
+            return _analyzer.analyze_quick(password), "quick"
+        try:
+            analysis = await loop.run_in_executor(
+                _analysis_pool, _analyzer.analyze_comprehensive, password
+            )
+        finally:
+            _admission.release()
+        if _results.blocking:
+            _cache_pool.submit(_results.set, password, analysis)
+        else:
+            _results.set(password, analysis)
+        return analysis, "full"
+    
+    def _client_ip(self) -> str:
+        # router.session.client_ip is the first X-Forwarded-For entry, which
+        # any client can set; start from the socket peer instead
+        headers = self.router.headers.raw_headers
+        return client_ip(headers.get("asgi-scope-client", ""),
+                         headers.get("x-forwarded-for", ""), _admission.trusted_proxies)
+    
+    async def generate_password(self):
         """Generate password with custom settings"""
         if not (self.use_uppercase or self.use_lowercase or self.use_numbers or self.use_symbols):
             self.generated_password = "⚠️ Please select at least one character type"
@@ -73,7 +167,12 @@ class State(rx.State):
         )
         
         if self.generated_password and "⚠️" not in self.generated_password:
-            self.analyze_password(self.generated_password)
+            await self.analyze_password(self.generated_password)
+            return [
+                rx.set_value(PASSWORD_INPUT_ID, self.generated_password),
+                # set_value fires no input event, so scorer.js has not seen it
+                _settle_estimate(self.generated_password),
+            ]
     
     def toggle_password_visibility(self):
         self.show_password = not self.show_password
@@ -89,27 +188,30 @@ class State(rx.State):
             self.password_length += 1
     
     def decrease_length(self):
-        if self.password_length > 8:
+        if self.password_length > MIN_GENERATED_LENGTH:
             self.password_length -= 1
     
     def _check_nist_compliance(self, password: str) -> bool:
-        if len(password) < 8:
-            return False
-        common_passwords = ["password", "123456", "123456789", "qwerty", "abc123", "password123", "admin", "letmein", "welcome", "monkey"]
-        if password.lower() in common_passwords:
-            return False
-        if len(set(password)) < 4:
-            return False
-        return True
+        return _analyzer.is_nist_compliant(password)
     
     def _reset_analysis(self):
-        self.score = 0
-        self.strength = "Very Weak"
-        self.feedback = []
-        self.entropy = 0.0
-        self.crack_time = ""
-        self.patterns_found = []
-        self.nist_compliant = False
+        self._update_fields(
+            analysis_tier="",
+            score=0,
+            strength="Very Weak",
+            feedback=[],
+            entropy=0.0,
+            crack_time="",
+            patterns_found=[],
+            nist_compliant=False
+        )
+    
+    def _update_fields(self, **fields):
+        # Assigning a var marks it dirty even when the value is unchanged,
+        # so compare first to keep untouched fields out of the delta.
+        for name, value in fields.items():
+            if getattr(self, name) != value:
+                setattr(self, name, value)
     
     def set_use_uppercase(self, value: bool):
         self.use_uppercase = value
@@ -128,85 +230,56 @@ def modern_card(*children, **props) -> rx.Component:
     return rx.box(
         *children,
         style={
-            "background": rx.cond(
-                State.dark_mode,
-                "rgba(255, 255, 255, 0.05)",
-                "rgba(255, 255, 255, 0.8)"
-            ),
+            "background": "var(--card-bg)",
             "backdrop_filter": "blur(20px)",
-            "border": rx.cond(
-                State.dark_mode,
-                "1px solid rgba(255, 255, 255, 0.1)",
-                "1px solid rgba(0, 0, 0, 0.1)"
-            ),
+            "border": "var(--card-border)",
             "border_radius": "16px",
             "padding": "30px",
-            "box_shadow": rx.cond(
-                State.dark_mode,
-                "0 25px 50px -12px rgba(0, 0, 0, 0.25)",
-                "0 25px 50px -12px rgba(0, 0, 0, 0.15)"
-            ),
+            "box_shadow": "var(--card-shadow)",
             "transition": "all 0.4s cubic-bezier(0.4, 0, 0.2, 1)",
             "width": "100%",
             "max_width": "600px",
             "margin": "0 auto",
             "_hover": {
                 "transform": "translateY(-8px)",
-                "box_shadow": rx.cond(
-                    State.dark_mode,
-                    "0 35px 70px -12px rgba(0, 0, 0, 0.35)",
-                    "0 35px 70px -12px rgba(0, 0, 0, 0.25)"
-                ),
-                "background": rx.cond(
-                    State.dark_mode,
-                    "rgba(255, 255, 255, 0.08)",
-                    "rgba(255, 255, 255, 0.9)"
-                )
+                "box_shadow": "var(--card-shadow-hover)",
+                "background": "var(--card-bg-hover)"
             }
         },
         **props
     )
 
-def animated_input(placeholder: str, value: str, on_change, input_type: str = "text") -> rx.Component:
-    """Modern rectangular animated input field"""
+def animated_input(placeholder: str, on_change, input_type: str = "text", input_id: str = "") -> rx.Component:
+    """Modern rectangular animated input field (uncontrolled, debounced)"""
     return rx.box(
-        rx.input(
-            placeholder=placeholder,
-            value=value,
-            on_change=on_change,
-            type_=input_type,
-            style={
-                "width": "100%",
-                "height": "56px",  # Slightly more rectangular
-                "background": rx.cond(
-                    State.dark_mode,
-                    "rgba(15, 15, 35, 0.8)",
-                    "rgba(255, 255, 255, 0.9)"
-                ),
-                "border": rx.cond(
-                    State.dark_mode,
-                    "2px solid rgba(255, 255, 255, 0.1)",
-                    "2px solid rgba(0, 0, 0, 0.1)"
-                ),
-                "border_radius": "12px",
-                "padding": "16px 20px",
-                "font_size": "16px",
-                "color": rx.cond(State.dark_mode, "white", "#1a202c"),
-                "font_family": "'SF Pro Display', -apple-system, sans-serif",
-                "transition": "all 0.3s ease",
-                "_focus": {
-                    "border_color": "#667eea",
-                    "box_shadow": "0 0 0 4px rgba(102, 126, 234, 0.2)",
-                    "background": rx.cond(
-                        State.dark_mode,
-                        "rgba(15, 15, 35, 0.9)",
-                        "rgba(255, 255, 255, 1.0)"
-                    )
-                },
-                "_placeholder": {
-                    "color": rx.cond(State.dark_mode, "rgba(255, 255, 255, 0.5)", "rgba(0, 0, 0, 0.5)")
+        rx.debounce_input(
+            rx.input(
+                placeholder=placeholder,
+                on_change=on_change,
+                type_=input_type,
+                id=input_id,
+                style={
+                    "width": "100%",
+                    "height": "56px",  # Slightly more rectangular
+                    "background": "var(--input-bg)",
+                    "border": "var(--input-border)",
+                    "border_radius": "12px",
+                    "padding": "16px 20px",
+                    "font_size": "16px",
+                    "color": "var(--text-primary)",
+                    "font_family": "var(--font-sans)",
+                    "transition": "all 0.3s ease",
+                    "_focus": {
+                        "border_color": "#667eea",
+                        "box_shadow": "0 0 0 4px rgba(102, 126, 234, 0.2)",
+                        "background": "var(--input-bg-focus)"
+                    },
+                    "_placeholder": {
+                        "color": "var(--text-placeholder)"
+                    }
                 }
-            }
+            ),
+            debounce_timeout=ANALYSIS_DEBOUNCE_MS
         ),
         style={
             "position": "relative",
@@ -249,7 +322,7 @@ def modern_switch(is_checked, on_change, label: str) -> rx.Component:
         rx.text(
             label,
             style={
-                "color": rx.cond(State.dark_mode, "rgba(255,255,255,0.9)", "rgba(0,0,0,0.9)"),
+                "color": "var(--text-secondary)",
                 "font_weight": "600",
                 "font_size": "15px"
             }
@@ -309,7 +382,7 @@ def strength_meter() -> rx.Component:
                 rx.text(
                     f"Strength: {State.strength}",
                     style={
-                        "color": rx.cond(State.dark_mode, "white", "#1a202c"), 
+                        "color": "var(--text-primary)", 
                         "font_weight": "600"
                     }
                 ),
@@ -321,6 +394,14 @@ def strength_meter() -> rx.Component:
                 width="100%"
             ),
             
+            rx.cond(
+                State.analysis_tier == "quick",
+                rx.text(
+                    "Quick analysis: the server is busy, so the zxcvbn and breach checks were skipped",
+                    style={"color": "var(--text-muted)", "font_size": "12px"}
+                )
+            ),
+            
             # Security Tips
             rx.cond(
                 State.score < 80,
@@ -328,7 +409,7 @@ def strength_meter() -> rx.Component:
                     rx.text(
                         "Security Tips:",
                         style={
-                            "color": rx.cond(State.dark_mode, "white", "#1a202c"),
+                            "color": "var(--text-primary)",
                             "font_weight": "600",
                             "font_size": "14px",
                             "margin_bottom": "8px"
@@ -341,7 +422,7 @@ def strength_meter() -> rx.Component:
                             "• Consider adding more special characters • Avoid common patterns"
                         ),
                         style={
-                            "color": rx.cond(State.dark_mode, "rgba(255,255,255,0.8)", "rgba(0,0,0,0.8)"),
+                            "color": "var(--text-muted)",
                             "font_size": "12px",
                             "line_height": "1.4"
                         }
@@ -384,7 +465,7 @@ def password_history() -> rx.Component:
                             rx.text(
                                 item["timestamp"],
                                 style={
-                                    "color": rx.cond(State.dark_mode, "rgba(255,255,255,0.7)", "rgba(0,0,0,0.7)"),
+                                    "color": "var(--text-subtle)",
                                     "font_size": "12px",
                                     "width": "80px"
                                 }
@@ -401,7 +482,7 @@ def password_history() -> rx.Component:
                             rx.text(
                                 item["strength"],
                                 style={
-                                    "color": rx.cond(State.dark_mode, "rgba(255,255,255,0.8)", "rgba(0,0,0,0.8)"),
+                                    "color": "var(--text-muted)",
                                     "font_size": "12px",
                                     "flex": "1"
                                 }
@@ -439,13 +520,25 @@ def password_analyzer() -> rx.Component:
             
             animated_input(
                 "Enter your password...",
-                State.password,
                 State.analyze_password,
-                "password"
+                "password",
+                PASSWORD_INPUT_ID
+            ),
+            
+            # Filled in by assets/scorer.js while the server result is pending
+            # and cleared when it lands (see _settle_estimate)
+            rx.text(
+                "",
+                id=INSTANT_ESTIMATE_ID,
+                style={
+                    "color": "#a855f7",
+                    "font_size": "14px",
+                    "min_height": "20px"
+                }
             ),
             
             rx.cond(
-                State.password != "",
+                State.has_password,
                 strength_meter()
             ),
             
@@ -473,7 +566,7 @@ def password_generator() -> rx.Component:
             rx.vstack(
                 rx.hstack(
                     rx.text("Length", style={
-                        "color": rx.cond(State.dark_mode, "white", "#1a202c"), 
+                        "color": "var(--text-primary)", 
                         "font_weight": "600", 
                         "font_size": "18px"
                     }),
@@ -543,7 +636,7 @@ def password_generator() -> rx.Component:
                 rx.text(
                     "Character Types",
                     style={
-                        "color": rx.cond(State.dark_mode, "white", "#1a202c"),
+                        "color": "var(--text-primary)",
                         "font_size": "20px",
                         "font_weight": "600"
                     }
@@ -589,7 +682,7 @@ def password_generator() -> rx.Component:
                     rx.text(
                         "Generated Password",
                         style={
-                        "color": rx.cond(State.dark_mode, "white", "#1a202c"), 
+                        "color": "var(--text-primary)", 
                         "font_weight": "600", 
                         "font_size": "18px"
                     }
@@ -651,11 +744,7 @@ def index() -> rx.Component:
                 "left": "0",
                 "width": "100%",
                 "height": "100%",
-                "background": rx.cond(
-                    State.dark_mode,
-                    "linear-gradient(135deg, #0c0c0c 0%, #1a1a2e 50%, #16213e 100%)",
-                    "linear-gradient(135deg, #f8fafc 0%, #e2e8f0 50%, #cbd5e1 100%)"
-                ),
+                "background": "var(--page-bg)",
                 "z_index": "-1"
             }
         ),
@@ -678,7 +767,7 @@ def index() -> rx.Component:
                         rx.text(
                             "Ultra-Modern Password Strength Checker",
                             style={
-                                "color": rx.cond(State.dark_mode, "rgba(255,255,255,0.7)", "rgba(0,0,0,0.7)"), 
+                                "color": "var(--text-subtle)", 
                                 "font_size": "16px"
                             }
                         ),
@@ -711,7 +800,7 @@ def index() -> rx.Component:
                         "Built with Reflex • Ultra-Modern Security",
                         style={
                             "text_align": "center",
-                            "color": rx.cond(State.dark_mode, "rgba(255,255,255,0.5)", "rgba(0,0,0,0.5)"),
+                            "color": "var(--text-faint)",
                             "font_size": "14px"
                         }
                     ),
@@ -737,17 +826,49 @@ def index() -> rx.Component:
             }
         ),
         
+        # The only theme-dependent node: styles read CSS variables that
+        # assets/animations.css switches on this attribute
+        custom_attrs={"data-theme": rx.cond(State.dark_mode, "dark", "light")},
         style={
             "min_height": "100vh",
-            "font_family": "'SF Pro Display', -apple-system, BlinkMacSystemFont, sans-serif"
+            "font_family": "var(--font-sans)"
         }
     )
 
+def head_components() -> list:
+    """Scripts and links injected into the page head"""
+    # assets/scorer.js scores with this node's policy, not a copy of the default
+    policy = json.dumps(_analyzer.policy.client_config()).replace("</", "<\\/")
+    components = [
+        rx.el.link(rel="manifest", href="/manifest.json"),
+        rx.script(f"window.PASS_CHECKER_POLICY = {policy};"),
+        rx.script(src="/scorer.js")
+    ]
+    # Font subsets listed in utils/fonts.PRELOAD_FACES (none by default)
+    for url in preload_urls():
+        components.append(rx.el.link(
+            rel="preload",
+            href=url,
+            type="font/woff2",
+            cross_origin="",
+            custom_attrs={"as": "font"}
+        ))
+    # Dev bundles are not content-hashed, so only production builds get the
+    # service worker (generated by utils/service_worker.py after export)
+    if rx.config.get_config().env == rx.Env.PROD:
+        components.append(rx.script(
+            "if ('serviceWorker' in navigator) {"
+            " window.addEventListener('load', function() {"
+            " navigator.serviceWorker.register('/sw.js'); }); }"
+        ))
+    return components
+
 # Create the app
 app = rx.App(
+    head_components=head_components(),
     stylesheets=[
-        "animations.css",
-        "https://fonts.googleapis.com/css2?family=SF+Pro+Display:wght@300;400;500;600;700;800;900&display=swap"
+        "fonts/fonts.css",
+        "animations.css"
     ]
 )
 app.add_page(index, route="/", title="SecurePass - Ultra-Modern Password Checker")
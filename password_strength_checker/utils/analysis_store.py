@@ -0,0 +1,125 @@
+import hashlib
+import hmac
+import json
+import os
+import sqlite3
+from typing import Dict, Optional
+
+from .digest import DIGEST_KEY_ENV, digest_key, keyed_digest
+from .password_analyzer import PasswordAnalyzer
+
+# Modules whose source decides a score; editing any of them invalidates the store
+_SCORING_MODULES = ("password_analyzer.py", "policy.py", "charclass.py", "near_match.py")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS results (digest BLOB PRIMARY KEY, result TEXT NOT NULL);
+"""
+
+
+def _zxcvbn_version() -> str:
+    try:
+        from importlib.metadata import version
+        return version("zxcvbn")
+    except Exception:
+        return "unknown"
+
+
+def scoring_fingerprint(analyzer: PasswordAnalyzer, key: bytes) -> str:
+    """Identify the scoring logic, policy, zxcvbn release and digest key"""
+    fingerprint = hashlib.sha256()
+    here = os.path.dirname(os.path.abspath(__file__))
+    for name in _SCORING_MODULES:
+        with open(os.path.join(here, name), "rb") as f:
+            fingerprint.update(hashlib.sha256(f.read()).digest())
+    fingerprint.update(analyzer.policy.fingerprint.encode("utf-8"))
+    fingerprint.update(_zxcvbn_version().encode("utf-8"))
+    # Digests made with another key can never match again, so a key change
+    # clears the store too. Only an HMAC of the key is recorded.
+    fingerprint.update(hmac.new(key, b"analysis-store", hashlib.sha256).digest())
+    return fingerprint.hexdigest()[:16]
+
+
+class AnalysisStore:
+    """Persistent analysis results for repeated audits, in SQLite (WAL mode)
+
+    Rows are keyed by the HMAC digest of the password, so the file holds no
+    plaintext. The store records the fingerprint of the scoring logic it was
+    filled with and empties itself when opened with a different one, so
+    results never outlive the code, policy or zxcvbn release that produced
+    them. Writes are committed every `commit_every` misses and on close.
+    Needs a stable key, passed in or from PASS_CHECKER_DIGEST_KEY: the
+    per-process fallback key changes every run, so the store would be
+    emptied on every open and never hit.
+    """
+
+    def __init__(self, path: str, analyzer: Optional[PasswordAnalyzer] = None,
+                 key: bytes = b"", commit_every: int = 1000):
+        self.path = path
+        self.analyzer = analyzer or PasswordAnalyzer()
+        if not key and not os.environ.get(DIGEST_KEY_ENV):
+            raise RuntimeError(f"An analysis store needs {DIGEST_KEY_ENV} so that its "
+                               f"digests stay valid across runs")
+        self.key = key or digest_key()
+        self.commit_every = commit_every
+        self.fingerprint = scoring_fingerprint(self.analyzer, self.key)
+        self.hits = 0
+        self.misses = 0
+        self._pending = 0
+
+        self._db = sqlite3.connect(path)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(_SCHEMA)
+        row = self._db.execute("SELECT value FROM meta WHERE name = 'fingerprint'").fetchone()
+        if row is None or row[0] != self.fingerprint:
+            with self._db:
+                self._db.execute("DELETE FROM results")
+                self._db.execute("INSERT OR REPLACE INTO meta VALUES ('fingerprint', ?)",
+                                 (self.fingerprint,))
+            if row is not None:
+                self._db.execute("VACUUM")
+
+    def __len__(self) -> int:
+        return self._db.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+
+    def get(self, digest: bytes) -> Optional[Dict]:
+        row = self._db.execute("SELECT result FROM results WHERE digest = ?", (digest,)).fetchone()
+        return json.loads(row[0]) if row is not None else None
+
+    def set(self, digest: bytes, result: Dict):
+        self._db.execute("INSERT OR REPLACE INTO results VALUES (?, ?)",
+                         (digest, json.dumps(result)))
+        self._pending += 1
+        if self._pending >= self.commit_every:
+            self.commit()
+
+    def get_or_analyze(self, password: str, digest: Optional[bytes] = None) -> Dict:
+        """Stored result for the password, analyzing and storing it on a miss
+
+        Pass `digest` when the caller already has the keyed digest (the reuse
+        detector computes it for every row). Always returns a fresh dict.
+        """
+        digest = digest or keyed_digest(password, self.key)
+        result = self.get(digest)
+        if result is not None:
+            self.hits += 1
+            return result
+        self.misses += 1
+        result = self.analyzer.analyze_comprehensive(password)
+        self.set(digest, result)
+        return result
+
+    def commit(self):
+        self._db.commit()
+        self._pending = 0
+
+    def close(self):
+        self.commit()
+        self._db.close()
+
+    def __enter__(self) -> "AnalysisStore":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
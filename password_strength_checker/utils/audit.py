@@ -0,0 +1,117 @@
+import argparse
+import csv
+import json
+import sys
+from typing import Dict, Iterable, Iterator, Optional, Tuple
+
+from .analysis_store import AnalysisStore
+from .digest import digest_key
+from .export import FORMATS, AuditWriter, summarize
+from .password_analyzer import PasswordAnalyzer
+from .reuse import MAX_TRACKED, ReuseDetector
+
+
+def read_rows(path: str, skip_header: bool = False) -> Iterator[Tuple[str, str]]:
+    """Stream (account, password) rows from a two-column CSV file"""
+    with open(path, newline="", encoding="utf-8") as f:
+        reader = csv.reader(f)
+        if skip_header:
+            next(reader, None)
+        for row in reader:
+            if len(row) >= 2:
+                yield row[0], row[1]
+
+
+def audit(rows: Iterable[Tuple[str, str]], analyzer: Optional[PasswordAnalyzer] = None,
+          detector: Optional[ReuseDetector] = None, analyze: bool = True,
+          store: Optional[AnalysisStore] = None) -> Iterator[Dict]:
+    """Analyze each row and feed it to the reuse detector
+
+    Yields one result per row, keyed by account and password digest; the
+    plaintext is dropped as soon as it has been analyzed. This is the
+    detector's first pass: once the stream is exhausted, run
+    `detector.verify()` over the same rows and join `detector.report()` on
+    the digest. With a `store`, passwords analyzed by an
+    earlier run under the same scoring fingerprint are not analyzed again.
+    """
+    analyzer = analyzer or PasswordAnalyzer()
+    detector = detector or ReuseDetector(digest_key())
+    for account, password in rows:
+        digest = detector.add(password)
+        if not analyze:
+            result = {}
+        elif store is not None:
+            result = store.get_or_analyze(password, digest if store.key == detector.key else None)
+        else:
+            result = analyzer.analyze_comprehensive(password)
+        result["account"] = account
+        result["digest"] = digest.hex()
+        yield result
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Audit a CSV of account,password rows for strength and reuse"
+    )
+    parser.add_argument("input", help="CSV file with account,password columns")
+    parser.add_argument("--skip-header", action="store_true")
+    parser.add_argument("--results", default="", help="write per-row results as JSON lines")
+    parser.add_argument("--reuse-report", default="-", help="reuse report path ('-' for stdout)")
+    parser.add_argument("--export", default="",
+                        help="write per-row results to a .parquet or .arrow file")
+    parser.add_argument("--export-format", choices=FORMATS, default="")
+    parser.add_argument("--summary", action="store_true",
+                        help="print score histogram and issue counts of the export")
+    parser.add_argument("--cache", default="",
+                        help="SQLite file of results reused across runs (needs PASS_CHECKER_DIGEST_KEY)")
+    parser.add_argument("--no-strength", action="store_true", help="only detect reuse")
+    parser.add_argument("--top", type=int, default=1000, help="clusters to list in the report")
+    parser.add_argument("--expected-rows", type=int, default=0,
+                        help="sizes the reuse sketch (default: count the input rows first)")
+    parser.add_argument("--sketch-width", type=int, default=0, help="override the sketch width")
+    parser.add_argument("--max-tracked", type=int, default=MAX_TRACKED,
+                        help="reused passwords counted exactly; beyond it only the most shared are kept")
+    args = parser.parse_args()
+
+    try:
+        store = AnalysisStore(args.cache) if args.cache and not args.no_strength else None
+    except RuntimeError as e:
+        parser.error(str(e))
+    expected_rows = args.expected_rows or sum(1 for _ in read_rows(args.input, args.skip_header))
+    detector = ReuseDetector(digest_key(), expected_rows=expected_rows,
+                             width=args.sketch_width or None, max_tracked=args.max_tracked)
+    results = audit(read_rows(args.input, args.skip_header), detector=detector,
+                    analyze=not args.no_strength, store=store)
+
+    writer = AuditWriter(args.export, args.export_format) if args.export else None
+    out = open(args.results, "w", encoding="utf-8") if args.results else None
+    try:
+        for result in results:
+            if writer:
+                writer.write(result)
+            if out:
+                out.write(json.dumps(result) + "\n")
+    finally:
+        if writer:
+            writer.close()
+        if out:
+            out.close()
+        if store:
+            store.close()
+            sys.stderr.write(f"analysis cache: {store.hits} hits, {store.misses} misses\n")
+
+    detector.verify(read_rows(args.input, args.skip_header))
+
+    if args.export and args.summary:
+        sys.stdout.write(json.dumps(summarize(args.export), indent=2) + "\n")
+
+    report = json.dumps(detector.report(args.top), indent=2)
+    if args.reuse_report == "-":
+        sys.stdout.write(report + "\n")
+    else:
+        with open(args.reuse_report, "w", encoding="utf-8") as f:
+            f.write(report)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+import unicodedata
+from typing import Dict
+
+# Character class bit flags. The ASCII classes keep their historical meaning
+# (a-z, A-Z, the policy's special characters); everything else is classified
+# by Unicode general category.
+LOWER = 1          # a-z
+UPPER = 2          # A-Z
+DIGIT = 4          # any decimal digit (Nd)
+SPECIAL = 8        # policy special characters, non-ASCII punctuation/symbols
+INTL_LOWER = 16    # non-ASCII lowercase letters (Ll), e.g. Cyrillic, Greek
+INTL_UPPER = 32    # non-ASCII uppercase/titlecase letters (Lu, Lt)
+INTL_LETTER = 64   # letters of caseless scripts (Lo, Lm), e.g. CJK, Arabic
+
+CASED_LETTERS = LOWER | UPPER | INTL_LOWER | INTL_UPPER
+LOWERCASE_LETTERS = LOWER | INTL_LOWER | INTL_LETTER
+UPPERCASE_LETTERS = UPPER | INTL_UPPER
+
+# Charset size each class contributes to entropy. Caseless scripts range from
+# ~22 letters (Hebrew) to thousands (CJK); 64 is deliberately conservative.
+CHARSET_SIZES: Dict[int, int] = {
+    LOWER: 26,
+    UPPER: 26,
+    DIGIT: 10,
+    SPECIAL: 32,
+    INTL_LOWER: 32,
+    INTL_UPPER: 32,
+    INTL_LETTER: 64,
+}
+
+_CATEGORY_CLASSES = {
+    "Ll": INTL_LOWER,
+    "Lu": INTL_UPPER,
+    "Lt": INTL_UPPER,
+    "Lo": INTL_LETTER,
+    "Lm": INTL_LETTER,
+    "Nd": DIGIT,
+}
+
+BMP_SIZE = 0x10000
+
+
+def _category_class(char: str) -> int:
+    category = unicodedata.category(char)
+    if category in _CATEGORY_CLASSES:
+        return _CATEGORY_CLASSES[category]
+    if category[0] in "PS":
+        return SPECIAL
+    return 0
+
+
+def _build_bmp_table() -> bytearray:
+    table = bytearray(_category_class(chr(code)) for code in range(BMP_SIZE))
+    # ASCII letters keep their own classes and ASCII punctuation only counts
+    # when the policy lists it as special, so ASCII scoring is unchanged
+    for code in range(128):
+        table[code] = 0
+    for code in range(ord("a"), ord("z") + 1):
+        table[code] = LOWER
+    for code in range(ord("A"), ord("Z") + 1):
+        table[code] = UPPER
+    for code in range(ord("0"), ord("9") + 1):
+        table[code] = DIGIT
+    return table
+
+
+# One byte per BMP code point, built once at import
+_BMP_TABLE = _build_bmp_table()
+
+
+class CharClassifier:
+    """O(1) per-character classification with the policy's special set
+
+    BMP characters are a single table lookup; astral characters (emoji,
+    historic scripts) are rare enough to classify on the fly.
+    """
+
+    def __init__(self, special_characters: str):
+        self._table = bytearray(_BMP_TABLE)
+        for char in special_characters:
+            code = ord(char)
+            if code < BMP_SIZE:
+                self._table[code] = SPECIAL
+
+    def classify(self, password: str) -> int:
+        """Bitmask of every class present in the password"""
+        table = self._table
+        mask = 0
+        for char in set(password):
+            code = ord(char)
+            mask |= table[code] if code < BMP_SIZE else _category_class(char)
+        return mask
+
+
+def is_caseless(mask: int) -> bool:
+    """Letters only from scripts without case, which cannot add uppercase"""
+    return bool(mask & INTL_LETTER) and not mask & CASED_LETTERS
+
+
+def charset_size(mask: int) -> int:
+    """Size of the alphabet implied by a class bitmask"""
+    return sum(size for flag, size in CHARSET_SIZES.items() if mask & flag)
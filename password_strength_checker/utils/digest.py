@@ -0,0 +1,21 @@
+import hashlib
+import hmac
+import os
+import secrets
+
+# Every node sharing a cache or audit store must use the same key, otherwise
+# their digests will not match. Without one, a per-process key is generated.
+DIGEST_KEY_ENV = "PASS_CHECKER_DIGEST_KEY"
+
+_process_key = secrets.token_bytes(32)
+
+
+def digest_key() -> bytes:
+    """Return the configured HMAC key, or this process's random fallback"""
+    key = os.environ.get(DIGEST_KEY_ENV)
+    return key.encode("utf-8") if key else _process_key
+
+
+def keyed_digest(password: str, key: bytes = b"") -> bytes:
+    """HMAC-SHA256 of a password, so plaintext never needs to be stored"""
+    return hmac.new(key or digest_key(), password.encode("utf-8"), hashlib.sha256).digest()
@@ -0,0 +1,180 @@
+import os
+from collections import Counter
+from typing import Dict, List, Optional
+
+from .policy import load_policy
+
+PARQUET = "parquet"
+ARROW = "arrow"
+FORMATS = (PARQUET, ARROW)
+
+# Columns buffered per row group; everything a report needs, never plaintext
+_COLUMNS = (
+    "account", "digest", "score", "strength", "length", "entropy",
+    "basic_score", "zxcvbn_score", "pattern_score", "crack_time",
+    "is_breached", "issues", "feedback",
+)
+
+
+def _pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.compute
+        import pyarrow.ipc
+        import pyarrow.parquet
+    except ImportError as e:
+        raise ImportError("Exporting audit results requires `pip install pyarrow`") from e
+    return pyarrow
+
+
+def format_for(path: str) -> str:
+    """Pick the format from the file extension (.parquet or .arrow/.feather)"""
+    return PARQUET if os.path.splitext(path)[1].lower() in (".parquet", ".pq") else ARROW
+
+
+class AuditWriter:
+    """Stream audit results into a columnar file, one row group at a time
+
+    Only `row_group_size` rows are held in memory. Strength labels are
+    dictionary-encoded against the policy's fixed label set, so every batch
+    shares one dictionary (which the Arrow IPC file format requires).
+    """
+
+    def __init__(self, path: str, file_format: str = "", row_group_size: int = 65536,
+                 labels: Optional[List[str]] = None):
+        pa = _pyarrow()
+        self.path = path
+        self.file_format = file_format or format_for(path)
+        if self.file_format not in FORMATS:
+            raise ValueError(f"Unknown export format {self.file_format!r}, expected one of {FORMATS}")
+        self.row_group_size = row_group_size
+        self.rows = 0
+
+        labels = labels or [label for _, label in load_policy().strength_labels]
+        self._label_index = {label: i for i, label in enumerate(labels)}
+        self._labels = pa.array(labels, pa.string())
+        self.schema = pa.schema([
+            ("account", pa.string()),
+            ("digest", pa.binary(32)),
+            ("score", pa.float32()),
+            ("strength", pa.dictionary(pa.int8(), pa.string())),
+            ("length", pa.int32()),
+            ("entropy", pa.float32()),
+            ("basic_score", pa.int16()),
+            ("zxcvbn_score", pa.int16()),
+            ("pattern_score", pa.int16()),
+            ("crack_time", pa.string()),
+            ("is_breached", pa.bool_()),
+            ("issues", pa.list_(pa.string())),
+            ("feedback", pa.list_(pa.string())),
+        ])
+        self._buffer: Dict[str, list] = {name: [] for name in _COLUMNS}
+
+        if self.file_format == PARQUET:
+            self._writer = pa.parquet.ParquetWriter(path, self.schema, compression="zstd")
+        else:
+            self._sink = pa.OSFile(path, "wb")
+            self._writer = pa.ipc.new_file(self._sink, self.schema)
+
+    def write(self, result: Dict):
+        """Buffer one result from `audit()` / `analyze_comprehensive`"""
+        buffer = self._buffer
+        digest = result.get("digest")
+        buffer["account"].append(result.get("account"))
+        buffer["digest"].append(bytes.fromhex(digest) if digest else None)
+        buffer["score"].append(result.get("score", 0))
+        buffer["strength"].append(self._label_index.get(result.get("strength")))
+        buffer["length"].append(result.get("length", 0))
+        buffer["entropy"].append(result.get("entropy", 0.0))
+        buffer["basic_score"].append(result.get("basic", {}).get("score"))
+        buffer["zxcvbn_score"].append(result.get("zxcvbn", {}).get("score"))
+        buffer["pattern_score"].append(result.get("patterns", {}).get("score"))
+        buffer["crack_time"].append(result.get("zxcvbn", {}).get("crack_time"))
+        buffer["is_breached"].append(result.get("is_breached"))
+        buffer["issues"].append(result.get("patterns", {}).get("issues", []))
+        buffer["feedback"].append(result.get("feedback", []))
+        if len(buffer["account"]) >= self.row_group_size:
+            self.flush()
+
+    def flush(self):
+        count = len(self._buffer["account"])
+        if not count:
+            return
+        pa = _pyarrow()
+        arrays = []
+        for field in self.schema:
+            values = self._buffer[field.name]
+            if field.name == "strength":
+                arrays.append(pa.DictionaryArray.from_arrays(pa.array(values, pa.int8()), self._labels))
+            else:
+                arrays.append(pa.array(values, field.type))
+        batch = pa.RecordBatch.from_arrays(arrays, schema=self.schema)
+        if self.file_format == PARQUET:
+            self._writer.write_batch(batch, row_group_size=count)
+        else:
+            self._writer.write_batch(batch)
+        self.rows += count
+        self._buffer = {name: [] for name in _COLUMNS}
+
+    def close(self):
+        self.flush()
+        self._writer.close()
+        if self.file_format == ARROW:
+            self._sink.close()
+
+    def __enter__(self) -> "AuditWriter":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def _batches(path: str, columns: List[str]):
+    """Yield record batches without loading the whole file"""
+    pa = _pyarrow()
+    if format_for(path) == PARQUET:
+        yield from pa.parquet.ParquetFile(path).iter_batches(columns=columns)
+        return
+    with pa.memory_map(path) as source:
+        reader = pa.ipc.open_file(source)
+        for i in range(reader.num_record_batches):
+            yield reader.get_batch(i).select(columns)
+
+
+def summarize(path: str, bin_width: int = 10) -> Dict:
+    """Score histogram, strength distribution and issue counts of an export"""
+    pa = _pyarrow()
+    pc = pa.compute
+    rows = 0
+    breached = 0
+    score_total = 0.0
+    histogram: Counter = Counter()
+    strengths: Counter = Counter()
+    issues: Counter = Counter()
+
+    def count_values(counter: Counter, array):
+        for item in pc.value_counts(array).to_pylist():
+            if item["values"] is not None:
+                counter[item["values"]] += item["counts"]
+
+    for batch in _batches(path, ["score", "strength", "is_breached", "issues"]):
+        rows += batch.num_rows
+        scores = batch.column("score")
+        score_total += pc.sum(scores).as_py() or 0.0
+        breached += pc.sum(pc.cast(batch.column("is_breached"), pa.int64())).as_py() or 0
+        bins = pc.multiply(pc.floor(pc.divide(scores, float(bin_width))), float(bin_width))
+        # A perfect 100 belongs to the top bin rather than a bin of its own
+        bins = pc.min_element_wise(bins, float(100 - bin_width))
+        count_values(histogram, pc.cast(bins, pa.int32()))
+        count_values(strengths, batch.column("strength").dictionary_decode())
+        count_values(issues, pc.list_flatten(batch.column("issues")))
+
+    return {
+        "rows": rows,
+        "mean_score": score_total / rows if rows else 0.0,
+        "breached": breached,
+        "score_histogram": {f"{low}-{min(low + bin_width, 100)}": histogram[low]
+                            for low in sorted(histogram)},
+        "strength": dict(strengths.most_common()),
+        "issues": dict(issues.most_common()),
+    }
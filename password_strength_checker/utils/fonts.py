@@ -0,0 +1,179 @@
+import argparse
+import os
+import shutil
+import textwrap
+from typing import Dict, List, Tuple
+
+FONTS_DIR = os.path.join("assets", "fonts")
+FONT_PREFIX = "securepass"
+FONT_FAMILY = "SecurePass Sans"
+POSTSCRIPT_FAMILY = "SecurePassSans"
+
+# Unicode ranges per subset, written into the unicode-range of each
+# @font-face rule in assets/fonts/fonts.css
+SUBSETS: Dict[str, str] = {
+    "latin": (
+        "U+0000-00FF,U+0131,U+0152-0153,U+02BB-02BC,U+02C6,U+02DA,U+02DC,"
+        "U+2000-206F,U+2074,U+20AC,U+2122,U+2191,U+2193,U+2212,U+2215,"
+        "U+FEFF,U+FFFD"
+    ),
+    "latin-ext": (
+        "U+0100-02AF,U+0304,U+0308,U+0329,U+1E00-1E9F,U+1EF2-1EFF,U+2020,"
+        "U+20A0-20AB,U+20AD-20C0,U+2113,U+2C60-2C7F,U+A720-A7FF"
+    ),
+}
+
+# Weights the UI uses (500 and 800 resolve to their nearest neighbours),
+# with the style name and the installed SF Pro faces preferred over a download
+WEIGHTS: Dict[int, Tuple[str, Tuple[str, ...]]] = {
+    400: ("Regular", ("SF Pro Display", "SFProDisplay-Regular")),
+    600: ("Semibold", ("SF Pro Display Semibold", "SFProDisplay-Semibold")),
+    700: ("Bold", ("SF Pro Display Bold", "SFProDisplay-Bold")),
+    900: ("Black", ("SF Pro Display Black", "SFProDisplay-Black")),
+}
+
+# Faces that get a preload hint. None by default: with font-display: swap
+# text paints in the fallback stack first, and benchmarks/first_paint.py
+# showed a preloaded subset competing with the stylesheet bundle, delaying
+# first paint by 40-90 ms on 4g/fast-3g to land the font 10-50 ms sooner
+PRELOAD_FACES: Tuple[Tuple[int, str], ...] = ()
+
+# Name table entries that carry the source family name. Subsets are
+# modified fonts, and OFL fonts may reserve their name, so they are renamed.
+_RENAMED_IDS = (1, 2, 3, 4, 6, 16, 17, 18, 21, 22, 25)
+
+
+def subset_filename(subset: str, weight: int = 400) -> str:
+    return f"{FONT_PREFIX}-{weight}-{subset}.woff2"
+
+
+def _rename(font, weight: int):
+    style = WEIGHTS[weight][0]
+    name = font["name"]
+    for name_id in _RENAMED_IDS:
+        name.removeNames(nameID=name_id)
+    values = {
+        1: FONT_FAMILY,
+        2: "Regular" if weight == 400 else style,
+        3: f"{POSTSCRIPT_FAMILY}-{style};subset",
+        4: f"{FONT_FAMILY} {style}",
+        6: f"{POSTSCRIPT_FAMILY}-{style}",
+    }
+    for name_id, value in values.items():
+        name.setName(value, name_id, 3, 1, 0x409)
+        name.setName(value, name_id, 1, 0, 0)
+
+
+def build_subsets(sources: Dict[int, str], output_dir: str = FONTS_DIR) -> List[str]:
+    """Write one WOFF2 file per weight and subset of static TTF/OTF source fonts
+
+    SF Pro cannot be redistributed, so point this at an openly licensed
+    family such as Source Sans Pro or Inter, and ship its license next to
+    the subsets. Requires fontTools with brotli support.
+    """
+    try:
+        from fontTools import subset
+    except ImportError as e:
+        raise ImportError("Building font subsets requires `pip install fonttools brotli`") from e
+
+    unknown = set(sources) - set(WEIGHTS)
+    if unknown:
+        raise ValueError(f"Unsupported weights {sorted(unknown)}, expected {sorted(WEIGHTS)}")
+
+    os.makedirs(output_dir, exist_ok=True)
+    written = []
+    for weight, source_font in sorted(sources.items()):
+        for name, ranges in SUBSETS.items():
+            options = subset.Options()
+            options.flavor = "woff2"
+            options.layout_features = ["*"]
+            options.hinting = False
+            options.desubroutinize = True
+            options.name_IDs = ["*"]
+
+            font = subset.load_font(source_font, options)
+            subsetter = subset.Subsetter(options)
+            subsetter.populate(unicodes=subset.parse_unicodes(ranges))
+            subsetter.subset(font)
+            _rename(font, weight)
+
+            path = os.path.join(output_dir, subset_filename(name, weight))
+            subset.save_font(font, path, options)
+            written.append(path)
+    return written
+
+
+def font_face_css(weights: List[int]) -> str:
+    """@font-face rules for the built weights, one per weight and subset"""
+    lines = [
+        "/* Generated by `python -m password_strength_checker.utils.fonts`; do not edit.",
+        " *",
+        " * Installed SF Pro Display is used when present. Otherwise the WOFF2",
+        " * subsets next to this file are loaded, and text renders in the system",
+        " * stack until they arrive (font-display: swap).",
+        " */",
+        "",
+    ]
+    for weight in sorted(weights):
+        local_names = WEIGHTS[weight][1]
+        local = ", ".join(f'local("{name}")' for name in local_names)
+        for name, ranges in SUBSETS.items():
+            lines += [
+                "@font-face {",
+                f'    font-family: "{FONT_FAMILY}";',
+                "    font-style: normal;",
+                f"    font-weight: {weight};",
+                "    font-display: swap;",
+                f"    src: {local},",
+                f'         url("/fonts/{subset_filename(name, weight)}") format("woff2");',
+                "    unicode-range: " + "\n                   ".join(
+                    textwrap.wrap(ranges.replace(",", ", "), width=66)
+                ) + ";",
+                "}",
+                "",
+            ]
+    lines += [
+        ":root {",
+        f'    --font-sans: "{FONT_FAMILY}", -apple-system, BlinkMacSystemFont, "Segoe UI",',
+        "                 Roboto, Helvetica, Arial, sans-serif;",
+        "}",
+        "",
+    ]
+    return "\n".join(lines)
+
+
+def preload_urls(fonts_dir: str = FONTS_DIR) -> List[str]:
+    """URLs of the critical subsets that have been built"""
+    return [
+        f"/fonts/{subset_filename(name, weight)}"
+        for weight, name in PRELOAD_FACES
+        if os.path.isfile(os.path.join(fonts_dir, subset_filename(name, weight)))
+    ]
+
+
+def _source(value: str) -> Tuple[int, str]:
+    weight, _, path = value.partition("=")
+    if not path or not weight.isdigit():
+        raise argparse.ArgumentTypeError(f"expected WEIGHT=PATH, got {value!r}")
+    return int(weight), path
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build subsetted WOFF2 fonts into assets/fonts")
+    parser.add_argument("sources", nargs="+", type=_source,
+                        help="WEIGHT=PATH pairs, e.g. 400=SourceSansPro-Regular.ttf")
+    parser.add_argument("--license", default="", help="font license file to copy next to the subsets")
+    parser.add_argument("--output-dir", default=FONTS_DIR)
+    args = parser.parse_args()
+
+    sources = dict(args.sources)
+    for path in build_subsets(sources, args.output_dir):
+        print(f"{path}: {os.path.getsize(path)} bytes")
+    with open(os.path.join(args.output_dir, "fonts.css"), "w", encoding="utf-8") as f:
+        f.write(font_face_css(list(sources)))
+    if args.license:
+        shutil.copyfile(args.license, os.path.join(args.output_dir, "LICENSE.txt"))
+
+
+if __name__ == "__main__":
+    main()
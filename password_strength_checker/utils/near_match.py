@@ -0,0 +1,212 @@
+import array
+import bisect
+import hashlib
+import mmap
+import os
+import re
+import struct
+import tempfile
+from typing import Dict, Iterable, List, Optional
+
+# Leetspeak and look-alike substitutions, folded onto one letter each. The
+# same folding is applied to dictionary words and queries, so ambiguous
+# characters ("1" as i or l) only have to agree, not be guessed.
+_FOLD = str.maketrans({
+    "@": "a", "4": "a",
+    "8": "b",
+    "(": "c",
+    "3": "e",
+    "9": "g", "6": "g",
+    "1": "i", "!": "i", "|": "i", "l": "i",
+    "0": "o",
+    "$": "s", "5": "s",
+    "7": "t", "+": "t",
+    "2": "z",
+})
+
+# Shorter words match too much by accident; assets/scorer.js uses the same
+NEAR_MATCH_MIN_LENGTH = 4
+
+# A dictionary word tolerates one edit per this many characters, so words
+# under six letters only match exactly after folding and affix stripping
+# ("admit" is not a variant of "admin"); assets/scorer.js uses the same
+NEAR_MATCH_CHARS_PER_EDIT = 6
+
+# Part of the saved file's magic; bump when the layout, hashing or folding changes
+INDEX_VERSION = 1
+_MAGIC = b"NEARIDX" + bytes([INDEX_VERSION])
+# Magic, max distance, min length, key count, word count, blob size
+_HEADER = struct.Struct("=8sIIIII4x")
+
+# Digits and symbols people prepend or append ("Password1!", "#1password")
+_AFFIXES = re.compile(r"^[\d\W_]+|[\d\W_]+$")
+
+
+def fold(word: str) -> str:
+    """Lowercase and undo leetspeak"""
+    return word.lower().translate(_FOLD)
+
+
+def allowed_distance(word: str, max_distance: int) -> int:
+    """Edits tolerated for a (folded) dictionary word of this length"""
+    return min(max_distance, len(word) // NEAR_MATCH_CHARS_PER_EDIT)
+
+
+def _hash(key: str) -> int:
+    # Stable across processes, unlike hash(), since the index is shared
+    return int.from_bytes(hashlib.blake2b(key.encode("utf-8"), digest_size=8).digest(), "little")
+
+
+def _deletes(word: str, distance: int) -> List[str]:
+    """Every string reachable from `word` by up to `distance` deletions"""
+    results = {word}
+    frontier = {word}
+    for _ in range(distance):
+        frontier = {w[:i] + w[i + 1:] for w in frontier for i in range(len(w))}
+        results |= frontier
+    return list(results)
+
+
+def _within_one(a: str, b: str) -> bool:
+    """Linear-time check for distance <= 1, the common configuration"""
+    if len(a) < len(b):
+        a, b = b, a
+    if len(a) - len(b) > 1:
+        return False
+    i = 0
+    while i < len(b) and a[i] == b[i]:
+        i += 1
+    if i == len(b):
+        return True
+    if len(a) != len(b):
+        return a[i + 1:] == b[i:]
+    return (a[i + 1:] == b[i + 1:] or
+            (a[i + 1:i + 2] == b[i:i + 1] and a[i:i + 1] == b[i + 1:i + 2] and a[i + 2:] == b[i + 2:]))
+
+
+def _within_distance(a: str, b: str, limit: int) -> bool:
+    """Optimal string alignment distance (edits plus adjacent swaps) <= limit"""
+    if limit <= 1:
+        return a == b if limit <= 0 else _within_one(a, b)
+    if abs(len(a) - len(b)) > limit:
+        return False
+    previous2: List[int] = []
+    previous = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        current = [i] + [0] * len(b)
+        for j in range(1, len(b) + 1):
+            cost = a[i - 1] != b[j - 1]
+            current[j] = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                current[j] = min(current[j], previous2[j - 2] + 1)
+        if min(current) > limit:
+            return False
+        previous2, previous = previous, current
+    return previous[-1] <= limit
+
+
+class NearMatchIndex:
+    """SymSpell-style deletion index over a folded password dictionary
+
+    Each word is stored under every string obtained by deleting up to its
+    allowed number of characters (see `allowed_distance`), so a lookup only
+    generates the query's own deletions and probes the index: cost depends
+    on the query length, not the dictionary size.
+
+    Keys are kept as sorted 64-bit hashes beside 32-bit word ids, 12 bytes
+    per key, with the words packed into one UTF-8 blob. A hash collision
+    only costs a comparison, since every candidate is checked against the
+    query. `save` writes the arrays to a file that `load` maps read-only,
+    so the workers on a host share one copy through the page cache.
+    """
+
+    def __init__(self, words: Iterable[str], max_distance: int = 1,
+                 min_length: int = NEAR_MATCH_MIN_LENGTH):
+        self.max_distance = max_distance
+        self.min_length = min_length
+        # Built as one sorted list of hash << 32 | id: about 50 bytes per
+        # key while indexing, which is why wordlist indexes are saved
+        ids: Dict[str, int] = {}
+        entries = []
+        for word in words:
+            folded = fold(word.strip())
+            if len(folded) < min_length or folded in ids:
+                continue
+            word_id = ids[folded] = len(ids)
+            for key in _deletes(folded, allowed_distance(folded, max_distance)):
+                entries.append(_hash(key) << 32 | word_id)
+        entries.sort()
+        self._keys = array.array("Q", (entry >> 32 for entry in entries))
+        self._ids = array.array("I", (entry & 0xFFFFFFFF for entry in entries))
+        del entries
+        blob = [word.encode("utf-8") for word in ids]
+        self._offsets = array.array("I", [0])
+        for encoded in blob:
+            self._offsets.append(self._offsets[-1] + len(encoded))
+        self._blob = b"".join(blob)
+
+    def save(self, path: str):
+        """Write the index for `load`, replacing `path` atomically"""
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path) or ".", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(_HEADER.pack(_MAGIC, self.max_distance, self.min_length, len(self._keys),
+                                     len(self._offsets) - 1, len(self._blob)))
+                for part in (self._keys, self._ids, self._offsets, self._blob):
+                    f.write(part)
+            os.replace(tmp, path)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+
+    @classmethod
+    def load(cls, path: str) -> "NearMatchIndex":
+        """Map an index written by `save` (on this host: native byte order)"""
+        with open(path, "rb") as f:
+            data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            magic, max_distance, min_length, keys, words, blob_size = _HEADER.unpack_from(data)
+        except struct.error:
+            magic = None
+        if magic != _MAGIC:
+            data.close()
+            raise ValueError(f"{path} is not a version {INDEX_VERSION} near-match index")
+        index = cls.__new__(cls)
+        index.max_distance = max_distance
+        index.min_length = min_length
+        view = memoryview(data)
+        start = _HEADER.size
+        parts = []
+        for size, code in ((8 * keys, "Q"), (4 * keys, "I"), (4 * (words + 1), "I"), (blob_size, None)):
+            part = view[start:start + size]
+            parts.append(part.cast(code) if code else part)
+            start += size
+        index._keys, index._ids, index._offsets, index._blob = parts
+        return index
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def _word(self, word_id: int) -> str:
+        return str(self._blob[self._offsets[word_id]:self._offsets[word_id + 1]], "utf-8")
+
+    def _candidates(self, password: str) -> List[str]:
+        candidates = [fold(password)]
+        stripped = _AFFIXES.sub("", password)
+        if stripped and stripped != password:
+            candidates.append(fold(stripped))
+        return [c for c in candidates if len(c) >= self.min_length]
+
+    def lookup(self, password: str) -> Optional[str]:
+        """Folded dictionary word the password is a near variant of, if any"""
+        size = len(self._keys)
+        for candidate in self._candidates(password):
+            for key in _deletes(candidate, self.max_distance):
+                key_hash = _hash(key)
+                i = bisect.bisect_left(self._keys, key_hash)
+                while i < size and self._keys[i] == key_hash:
+                    word = self._word(self._ids[i])
+                    if _within_distance(candidate, word, allowed_distance(word, self.max_distance)):
+                        return word
+                    i += 1
+        return None
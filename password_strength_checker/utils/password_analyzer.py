@@ -1,17 +1,22 @@
-import re
+import math
+import random
 import string
 import secrets
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Tuple
 from password_strength import PasswordStats
 from zxcvbn import zxcvbn
 import bcrypt
 
+from .charclass import (
+    DIGIT, LOWERCASE_LETTERS, SPECIAL, UPPERCASE_LETTERS, charset_size, is_caseless
+)
+from .policy import CompiledPolicy, load_policy
+
 class PasswordAnalyzer:
-    def __init__(self):
-        self.common_passwords = [
-            "password", "123456", "password123", "admin", "qwerty",
-            "letmein", "welcome", "monkey", "1234567890", "abc123"
-        ]
+    def __init__(self, policy: Optional[CompiledPolicy] = None):
+        # Weights, labels, character classes and rules all come from the policy
+        self.policy = policy or load_policy()
+        self.common_passwords = self.policy.common_passwords
         
     def analyze_comprehensive(self, password: str) -> Dict:
         """Comprehensive password analysis using multiple methods"""
@@ -24,14 +29,15 @@ class PasswordAnalyzer:
         pattern_analysis = self._pattern_analysis(password)
         
         # Combined score (weighted average)
+        basic_weight, zxcvbn_weight, pattern_weight = self.policy.weights
         combined_score = (
-            basic_analysis["score"] * 0.4 +
-            zxcvbn_analysis["score"] * 0.4 +
-            pattern_analysis["score"] * 0.2
+            basic_analysis["score"] * basic_weight +
+            zxcvbn_analysis["score"] * zxcvbn_weight +
+            pattern_analysis["score"] * pattern_weight
         )
         
+        # The plaintext is deliberately not part of the result
         return {
-            "password": password,
             "score": round(combined_score, 1),
             "strength": self._get_strength_label(combined_score),
             "length": len(password),
@@ -43,6 +49,35 @@ class PasswordAnalyzer:
             "entropy": self._calculate_entropy(password)
         }
     
+    def analyze_quick(self, password: str) -> Dict:
+        """Cheap analysis tier without zxcvbn or breach lookups
+        
+        Mirrored in assets/scorer.js for instant client-side feedback, so any
+        change here must be made there as well.
+        """
+        if not password:
+            return self._empty_result()
+        
+        basic_analysis = self._basic_analysis(password)
+        pattern_analysis = self._pattern_analysis(password)
+        
+        # Same weights as analyze_comprehensive, renormalized without zxcvbn
+        basic_weight, _, pattern_weight = self.policy.weights
+        quick_score = (
+            basic_analysis["score"] * basic_weight +
+            pattern_analysis["score"] * pattern_weight
+        ) / (basic_weight + pattern_weight)
+        
+        return {
+            "score": round(quick_score, 1),
+            "strength": self._get_strength_label(quick_score),
+            "length": len(password),
+            "basic": basic_analysis,
+            "patterns": pattern_analysis,
+            "feedback": self._generate_feedback(password, quick_score),
+            "entropy": self._calculate_entropy(password)
+        }
+    
     def _basic_analysis(self, password: str) -> Dict:
         """Enhanced basic password strength analysis"""
         score = 0
@@ -55,22 +90,29 @@ class PasswordAnalyzer:
         else:
             score += len(password) * 3
         
-        # Character diversity scoring
-        if re.search(r'[a-z]', password):
+        # Character diversity scoring (Unicode-aware, one table lookup per char)
+        classes = self.policy.classify(password)
+        has_uppercase = bool(classes & UPPERCASE_LETTERS)
+        has_lowercase = bool(classes & LOWERCASE_LETTERS)
+        has_digits = bool(classes & DIGIT)
+        has_special = bool(classes & SPECIAL)
+        
+        if has_lowercase:
             score += 15
-        if re.search(r'[A-Z]', password):
+        # Caseless scripts (CJK, Arabic, ...) are not penalized for lacking uppercase
+        if has_uppercase or is_caseless(classes):
             score += 15
-        if re.search(r'\d', password):
+        if has_digits:
             score += 15
-        if re.search(r'[!@#$%^&*(),.?":{}|<>]', password):
+        if has_special:
             score += 15
         
         return {
             "score": min(score, 100),
-            "has_uppercase": bool(re.search(r'[A-Z]', password)),
-            "has_lowercase": bool(re.search(r'[a-z]', password)),
-            "has_digits": bool(re.search(r'\d', password)),
-            "has_special": bool(re.search(r'[!@#$%^&*(),.?":{}|<>]', password)),
+            "has_uppercase": has_uppercase,
+            "has_lowercase": has_lowercase,
+            "has_digits": has_digits,
+            "has_special": has_special,
             "length_score": min(len(password) * 8, 100)
         }
     
@@ -89,22 +131,17 @@ class PasswordAnalyzer:
         score = 100
         issues = []
         
-        # Check for common patterns
-        if re.search(r'(.)\1{2,}', password):
-            score -= 20
-            issues.append("Repeated characters")
+        # Check for common patterns (all policy rules in one scan)
+        for issue, penalty in self.policy.pattern_issues(password):
+            score -= penalty
+            issues.append(issue)
             
-        if re.search(r'(012|123|234|345|456|567|678|789|890)', password):
-            score -= 15
-            issues.append("Sequential numbers")
-            
-        if re.search(r'(abc|bcd|cde|def|efg|fgh|ghi|hij|ijk|jkl|klm|lmn|mno|nop|opq|pqr|qrs|rst|stu|tuv|uvw|vwx|wxy|xyz)', password.lower()):
-            score -= 15
-            issues.append("Sequential letters")
-            
-        if password.lower() in self.common_passwords:
-            score -= 50
-            issues.append("Common password")
+        if self.policy.is_common(password):
+            score -= self.policy.common_penalty
+            issues.append(self.policy.common_issue)
+        elif self.policy.near_common(password):
+            score -= self.policy.near_penalty
+            issues.append(self.policy.near_issue)
             
         return {
             "score": max(score, 0),
@@ -113,25 +150,16 @@ class PasswordAnalyzer:
     
     def _calculate_entropy(self, password: str) -> float:
         """Calculate password entropy"""
-        charset_size = 0
-        if re.search(r'[a-z]', password):
-            charset_size += 26
-        if re.search(r'[A-Z]', password):
-            charset_size += 26
-        if re.search(r'\d', password):
-            charset_size += 10
-        if re.search(r'[!@#$%^&*(),.?":{}|<>]', password):
-            charset_size += 32
+        size = charset_size(self.policy.classify(password))
             
-        if charset_size == 0:
+        if size == 0:
             return 0
             
-        import math
-        return len(password) * math.log2(charset_size)
+        return len(password) * math.log2(size)
     
     def _check_breach_simulation(self, password: str) -> bool:
         """Simulate breach database check"""
-        return password.lower() in [p.lower() for p in self.common_passwords]
+        return self.policy.is_common(password)
     
     def _generate_feedback(self, password: str, score: float) -> List[str]:
         """Generate improvement feedback"""
@@ -141,36 +169,31 @@ class PasswordAnalyzer:
             feedback.append("Use at least 8 characters")
         if len(password) < 12:
             feedback.append("Consider using 12+ characters for better security")
-        if not re.search(r'[A-Z]', password):
+        classes = self.policy.classify(password)
+        if not classes & UPPERCASE_LETTERS and not is_caseless(classes):
             feedback.append("Add uppercase letters")
-        if not re.search(r'[a-z]', password):
+        if not classes & LOWERCASE_LETTERS:
             feedback.append("Add lowercase letters")
-        if not re.search(r'\d', password):
+        if not classes & DIGIT:
             feedback.append("Add numbers")
-        if not re.search(r'[!@#$%^&*(),.?":{}|<>]', password):
+        if not classes & SPECIAL:
             feedback.append("Add special characters")
         if score < 60:
             feedback.append("Avoid common words and patterns")
             
         return feedback
     
+    def is_nist_compliant(self, password: str) -> bool:
+        """Check the password against the policy's NIST rules"""
+        return self.policy.is_nist_compliant(password)
+    
     def _get_strength_label(self, score: float) -> str:
         """Convert score to strength label"""
-        if score >= 80:
-            return "Very Strong"
-        elif score >= 60:
-            return "Strong"
-        elif score >= 40:
-            return "Medium"
-        elif score >= 20:
-            return "Weak"
-        else:
-            return "Very Weak"
+        return self.policy.strength_label(score)
     
     def _empty_result(self) -> Dict:
         """Return empty analysis result"""
         return {
-            "password": "",
             "score": 0,
             "strength": "Very Weak",
             "length": 0,
@@ -182,21 +205,38 @@ class PasswordAnalyzer:
             "entropy": 0
         }
 
+# Generated passwords are never shorter than this, whatever length is requested
+MIN_GENERATED_LENGTH = 12
+
 class PasswordGenerator:
-    def __init__(self):
+    """Password generator backed by the OS CSPRNG
+
+    `rng` exists for reproducible benchmarks and tests only; see `seeded`.
+    """
+
+    def __init__(self, rng: Optional[random.Random] = None):
+        self.rng = rng or secrets.SystemRandom()
         self.lowercase = string.ascii_lowercase
         self.uppercase = string.ascii_uppercase
         self.digits = string.digits
         self.special = "!@#$%^&*(),.?\":{}|<>"
+
+    @classmethod
+    def seeded(cls, seed: int) -> "PasswordGenerator":
+        """Deterministic generator for reproducible corpora. Never use for real passwords."""
+        return cls(random.Random(seed))
     
     def generate(self, length: int = 16, use_uppercase: bool = True, 
                 use_lowercase: bool = True, use_digits: bool = True, 
                 use_special: bool = True, exclude_ambiguous: bool = True) -> str:
-        """Generate secure password optimized for 80%+ strength"""
+        """Generate secure password optimized for 80%+ strength
+
+        Lengths below MIN_GENERATED_LENGTH are raised to it.
+        """
         
         # Ensure minimum length for strong passwords
-        if length < 12:
-            length = 12
+        length = max(length, MIN_GENERATED_LENGTH)
+        choice = self.rng.choice
         
         charset = ""
         required_chars = []
@@ -207,7 +247,7 @@ class PasswordGenerator:
                 chars = chars.replace('l', '').replace('o', '')
             charset += chars
             # Add multiple lowercase chars for stronger passwords
-            required_chars.extend([secrets.choice(chars) for _ in range(2)])
+            required_chars.extend([choice(chars) for _ in range(2)])
             
         if use_uppercase:
             chars = self.uppercase
@@ -215,7 +255,7 @@ class PasswordGenerator:
                 chars = chars.replace('I', '').replace('O', '')
             charset += chars
             # Add multiple uppercase chars
-            required_chars.extend([secrets.choice(chars) for _ in range(2)])
+            required_chars.extend([choice(chars) for _ in range(2)])
             
         if use_digits:
             chars = self.digits
@@ -223,12 +263,12 @@ class PasswordGenerator:
                 chars = chars.replace('0', '').replace('1', '')
             charset += chars
             # Add multiple digits
-            required_chars.extend([secrets.choice(chars) for _ in range(2)])
+            required_chars.extend([choice(chars) for _ in range(2)])
             
         if use_special:
             charset += self.special
             # Add multiple special chars for stronger passwords
-            required_chars.extend([secrets.choice(self.special) for _ in range(2)])
+            required_chars.extend([choice(self.special) for _ in range(2)])
         
         if not charset:
             return "Please choose your preferable character type to generate a strong password..."
@@ -236,13 +276,13 @@ class PasswordGenerator:
         # Generate remaining characters
         remaining_length = length - len(required_chars)
         if remaining_length > 0:
-            password_chars = required_chars + [secrets.choice(charset) for _ in range(remaining_length)]
+            password_chars = required_chars + [choice(charset) for _ in range(remaining_length)]
         else:
             password_chars = required_chars[:length]
         
         # Shuffle multiple times for better randomness
         for _ in range(3):
-            secrets.SystemRandom().shuffle(password_chars)
+            self.rng.shuffle(password_chars)
         
         return ''.join(password_chars)
 
@@ -0,0 +1,244 @@
+import hashlib
+import json
+import os
+import re
+import tempfile
+from functools import lru_cache
+from typing import Callable, Dict, FrozenSet, List, Optional, Pattern, Tuple
+
+from .charclass import CharClassifier
+from .near_match import INDEX_VERSION, NEAR_MATCH_CHARS_PER_EDIT, NEAR_MATCH_MIN_LENGTH, NearMatchIndex
+
+POLICY_ENV = "PASS_CHECKER_POLICY"
+DEFAULT_POLICY_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "policies", "default.json"
+)
+
+# Relative cost of each NIST rule type; cheaper rules run first so a failing
+# password is rejected before the expensive checks
+NIST_RULE_COSTS = {
+    "min_length": 0,
+    "max_length": 0,
+    "not_in_list": 1,
+    "min_unique_chars": 2,
+    "forbid_regex": 3,
+    "require_regex": 3,
+}
+
+class PolicyError(ValueError):
+    """Raised when a policy file is malformed"""
+
+
+class CompiledPolicy:
+    """A scoring policy compiled into a single evaluation plan
+
+    Built once per policy file. Each pattern rule is precompiled on its own
+    (one `search` per rule beats a merged regex of lookaheads, which has to
+    try every rule at every position), and NIST rules become closures
+    ordered by cost so `is_nist_compliant` stops at the first failure.
+    """
+
+    def __init__(self, config: Dict, base_dir: str = ""):
+        try:
+            self.name: str = config.get("name", "custom")
+            weights = config["weights"]
+            self.weights: Tuple[float, float, float] = (
+                float(weights["basic"]), float(weights["zxcvbn"]), float(weights["patterns"])
+            )
+            self.strength_labels: List[Tuple[float, str]] = sorted(
+                ((float(entry["min_score"]), entry["label"]) for entry in config["strength_labels"]),
+                reverse=True
+            )
+            self.special_characters: str = config["special_characters"]
+
+            common = config.get("common_passwords", {})
+            self.common_passwords: FrozenSet[str] = frozenset(p.lower() for p in common.get("values", []))
+            self.common_penalty: int = common.get("penalty", 50)
+            self.common_issue: str = common.get("issue", "Common password")
+
+            near = config.get("near_match")
+            self.near_match_enabled = near is not None
+            near = near or {}
+            self.near_penalty: int = near.get("penalty", 30)
+            self.near_issue: str = near.get("issue", "Variation of a common password")
+            self._near_distance: int = int(near.get("max_distance", 1))
+            # Optional large list (one password per line), relative to the policy file
+            wordlist = near.get("wordlist")
+            self._near_wordlist = os.path.join(base_dir, wordlist) if wordlist else None
+            self._near_index: Optional[NearMatchIndex] = None
+
+            self._compile_patterns(config.get("patterns", []))
+            self._compile_nist(config.get("nist", []))
+        except (KeyError, TypeError, re.error) as e:
+            raise PolicyError(f"Invalid policy {config.get('name', '')!r}: {e}") from e
+
+        self.classifier = CharClassifier(self.special_characters)
+        fingerprint = hashlib.sha256(json.dumps(config, sort_keys=True).encode("utf-8"))
+        if self._near_wordlist:
+            with open(self._near_wordlist, "rb") as f:
+                fingerprint.update(hashlib.sha256(f.read()).digest())
+        self.fingerprint: str = fingerprint.hexdigest()[:12]
+
+    def _compile_patterns(self, rules: List[Dict]):
+        self.pattern_rules: List[Tuple[Pattern, str, int]] = []
+        self._client_patterns: List[Dict] = []
+        for rule in rules:
+            flags = re.IGNORECASE if rule.get("ignore_case") else 0
+            self.pattern_rules.append(
+                (re.compile(rule["regex"], flags), rule["issue"], int(rule["penalty"]))
+            )
+            self._client_patterns.append({
+                # JavaScript syntax, for rules whose Python regex does not port
+                "regex": rule.get("client_regex", rule["regex"]),
+                "ignore_case": bool(rule.get("ignore_case")),
+                "issue": rule["issue"],
+                "penalty": int(rule["penalty"]),
+            })
+
+    def _compile_nist(self, rules: List[Dict]):
+        checks: List[Tuple[int, Callable[[str], bool]]] = []
+        for rule in rules:
+            kind = rule["rule"]
+            if kind not in NIST_RULE_COSTS:
+                raise PolicyError(f"Unknown NIST rule {kind!r}")
+            checks.append((NIST_RULE_COSTS[kind], self._nist_check(kind, rule)))
+        checks.sort(key=lambda item: item[0])
+        self._nist_checks: List[Callable[[str], bool]] = [check for _, check in checks]
+
+    @staticmethod
+    def _nist_check(kind: str, rule: Dict) -> Callable[[str], bool]:
+        if kind == "min_length":
+            minimum = int(rule["value"])
+            return lambda password: len(password) >= minimum
+        if kind == "max_length":
+            maximum = int(rule["value"])
+            return lambda password: len(password) <= maximum
+        if kind == "not_in_list":
+            values = frozenset(v.lower() for v in rule["values"])
+            return lambda password: password.lower() not in values
+        if kind == "min_unique_chars":
+            minimum = int(rule["value"])
+            return lambda password: len(set(password)) >= minimum
+        pattern = re.compile(rule["regex"])
+        if kind == "forbid_regex":
+            return lambda password: pattern.search(password) is None
+        return lambda password: pattern.search(password) is not None
+
+    def pattern_issues(self, password: str) -> List[Tuple[str, int]]:
+        """(issue, penalty) for every pattern rule that matches, in policy order"""
+        return [(issue, penalty) for pattern, issue, penalty in self.pattern_rules
+                if pattern.search(password)]
+
+    def classify(self, password: str) -> int:
+        """Character class bitmask, see utils/charclass.py"""
+        return self.classifier.classify(password)
+
+    def is_common(self, password: str) -> bool:
+        return password.lower() in self.common_passwords
+
+    def build_near_index(self):
+        """Index the near-match words now rather than on the first lookup
+
+        Indexing a large wordlist takes seconds (about 8 s per 200k words),
+        so servers call this at startup and the cost is never paid inside a
+        request. The index is saved beside the wordlist, or in the temp
+        directory if that is read-only, and memory-mapped: later workers and
+        restarts load it instantly and share one copy of about 170 bytes
+        per word at distance 1.
+        """
+        if not self.near_match_enabled or self._near_index is not None:
+            return
+        if not self._near_wordlist:
+            self._near_index = NearMatchIndex(self._near_words(), self._near_distance)
+            return
+        paths = self._near_index_paths()
+        for path in paths:
+            try:
+                self._near_index = NearMatchIndex.load(path)
+                return
+            except (OSError, ValueError):
+                pass
+        index = NearMatchIndex(self._near_words(), self._near_distance)
+        for path in paths:
+            try:
+                index.save(path)
+                self._near_index = NearMatchIndex.load(path)
+                return
+            except OSError:
+                pass
+        # Nowhere to save it: this process keeps its own copy
+        self._near_index = index
+
+    def _near_index_paths(self) -> List[str]:
+        # The fingerprint covers the policy and the wordlist's contents
+        name = f"{os.path.basename(self._near_wordlist)}.{self.fingerprint}.near{INDEX_VERSION}"
+        return [os.path.join(os.path.dirname(self._near_wordlist), name),
+                os.path.join(tempfile.gettempdir(), name)]
+
+    def near_common(self, password: str) -> Optional[str]:
+        """Dictionary word the password is a leetspeak/affix/typo variant of"""
+        if not self.near_match_enabled:
+            return None
+        if self._near_index is None:
+            # Batch tools index on first use; the app builds it at startup
+            self.build_near_index()
+        return self._near_index.lookup(password)
+
+    def _near_words(self):
+        yield from self.common_passwords
+        if self._near_wordlist:
+            with open(self._near_wordlist, encoding="utf-8", errors="ignore") as f:
+                yield from f
+
+    def is_nist_compliant(self, password: str) -> bool:
+        return all(check(password) for check in self._nist_checks)
+
+    def strength_label(self, score: float) -> str:
+        for minimum, label in self.strength_labels:
+            if score >= minimum:
+                return label
+        return self.strength_labels[-1][1]
+
+    def client_config(self) -> Dict:
+        """What assets/scorer.js needs to mirror `analyze_quick` in the browser
+
+        The near-match check only covers the inline common passwords: a large
+        `near_match.wordlist` stays on the server, whose result replaces the
+        estimate once typing pauses (the page clears the estimate then).
+        """
+        basic_weight, _, pattern_weight = self.weights
+        return {
+            "name": self.name,
+            "fingerprint": self.fingerprint,
+            "weights": {"basic": basic_weight, "patterns": pattern_weight},
+            "strength_labels": [[minimum, label] for minimum, label in self.strength_labels],
+            "special_characters": self.special_characters,
+            "common_passwords": {
+                "values": sorted(self.common_passwords),
+                "penalty": self.common_penalty,
+                "issue": self.common_issue,
+            },
+            "near_match": {
+                "penalty": self.near_penalty,
+                "issue": self.near_issue,
+                "max_distance": self._near_distance,
+                "min_length": NEAR_MATCH_MIN_LENGTH,
+                "chars_per_edit": NEAR_MATCH_CHARS_PER_EDIT,
+            } if self.near_match_enabled else None,
+            "patterns": self._client_patterns,
+        }
+
+
+@lru_cache(maxsize=None)
+def _load(path: str) -> CompiledPolicy:
+    with open(path, encoding="utf-8") as f:
+        return CompiledPolicy(json.load(f), os.path.dirname(path))
+
+
+def load_policy(path: Optional[str] = None) -> CompiledPolicy:
+    """Load and compile a policy file, once per path
+
+    Defaults to PASS_CHECKER_POLICY if set, else the bundled default policy.
+    """
+    path = path or os.environ.get(POLICY_ENV) or DEFAULT_POLICY_PATH
+    return _load(os.path.abspath(path))
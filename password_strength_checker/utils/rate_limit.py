@@ -0,0 +1,135 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+
+# AdmissionController.from_env reads each argument from its variable
+LIMIT_ENV = {
+    "session_rate": "PASS_CHECKER_SESSION_RATE",
+    "session_burst": "PASS_CHECKER_SESSION_BURST",
+    "ip_rate": "PASS_CHECKER_IP_RATE",
+    "ip_burst": "PASS_CHECKER_IP_BURST",
+    "max_concurrent": "PASS_CHECKER_MAX_CONCURRENT",
+    "max_keys": "PASS_CHECKER_RATE_LIMIT_KEYS",
+    "trusted_proxies": "PASS_CHECKER_TRUSTED_PROXIES",
+}
+
+
+def client_ip(peer: str, forwarded_for: str = "", trusted_proxies: int = 0) -> str:
+    """The address to rate limit a connection by
+
+    Each proxy appends the address it got the request from to
+    X-Forwarded-For, so behind `trusted_proxies` proxies the client is that
+    many entries from the right. Entries further left come from the client
+    and may be forged, and without trusted proxies the header is ignored.
+    """
+    hops = [hop.strip() for hop in forwarded_for.split(",") if hop.strip()]
+    if trusted_proxies <= 0 or not hops:
+        return peer
+    return hops[-min(trusted_proxies, len(hops))]
+
+
+class TokenBucket:
+    """Classic token bucket: `rate` tokens per second, bursts up to `capacity`"""
+
+    __slots__ = ("rate", "capacity", "tokens", "updated")
+
+    def __init__(self, rate: float, capacity: float, now: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = now
+
+    def consume(self, now: float, amount: float = 1.0) -> bool:
+        """Refill for the elapsed time, then take `amount` tokens if available"""
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if self.tokens >= amount:
+            self.tokens -= amount
+            return True
+        return False
+
+
+class RateLimiter:
+    """Token buckets per key, with least-recently-used keys evicted
+
+    Memory stays bounded at `max_keys` buckets. An evicted key starts over
+    with a full bucket, so once more than `max_keys` keys are active at once
+    (a flooder cycling through keys, say) a key can exceed its rate; size
+    `max_keys` above the number of clients expected at the same time.
+    """
+
+    def __init__(self, rate: float, capacity: float, max_keys: int = 10000):
+        self.rate = rate
+        self.capacity = capacity
+        self.max_keys = max_keys
+        self._buckets: "OrderedDict[str, TokenBucket]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def allow(self, key: str, now: Optional[float] = None) -> bool:
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                bucket = TokenBucket(self.rate, self.capacity, now)
+                self._buckets[key] = bucket
+                if len(self._buckets) > self.max_keys:
+                    self._buckets.popitem(last=False)
+            else:
+                self._buckets.move_to_end(key)
+            return bucket.consume(now)
+
+
+class AdmissionController:
+    """Decides whether an analysis request may run the expensive tier
+
+    A request is admitted when both its session and its IP have tokens left
+    and a slot is free under the global concurrency cap. Rejected requests
+    are meant to fall back to the cheap tier rather than wait, so admission
+    never blocks. The cap only limits parallel work if admitted requests run
+    off the event loop, in an executor with `max_concurrent` workers.
+
+    Session tokens are picked by the client, so the session bucket only
+    keeps one tab from using up its IP's tokens. The IP bucket is what
+    bounds a flooder, as long as the IP is the socket peer or comes from a
+    trusted proxy (see `client_ip`).
+    """
+
+    def __init__(self, session_rate: float = 5.0, session_burst: float = 10.0,
+                 ip_rate: float = 20.0, ip_burst: float = 40.0,
+                 max_concurrent: int = 8, max_keys: int = 10000,
+                 trusted_proxies: int = 0):
+        self.sessions = RateLimiter(session_rate, session_burst, max_keys)
+        self.ips = RateLimiter(ip_rate, ip_burst, max_keys)
+        self.max_concurrent = max_concurrent
+        self.trusted_proxies = trusted_proxies
+        self._slots = threading.BoundedSemaphore(max_concurrent)
+
+    @classmethod
+    def from_env(cls, **kwargs) -> "AdmissionController":
+        """Override the defaults with any of the LIMIT_ENV variables set"""
+        for name, env in LIMIT_ENV.items():
+            value = os.environ.get(env)
+            if not value:
+                continue
+            kind = int if name in ("max_concurrent", "max_keys", "trusted_proxies") else float
+            try:
+                kwargs[name] = kind(value)
+            except ValueError:
+                raise RuntimeError(f"{env} must be {'an integer' if kind is int else 'a number'}, "
+                                   f"got {value!r}") from None
+        return cls(**kwargs)
+
+    def try_acquire(self, session: str, ip: str) -> bool:
+        """Admit a request; callers must `release()` once it has finished"""
+        # Check the session first so a flooding tab drains its own bucket
+        # before it can eat into the tokens shared by everyone on its IP
+        if not self.sessions.allow(session):
+            return False
+        if ip and not self.ips.allow(ip):
+            return False
+        return self._slots.acquire(blocking=False)
+
+    def release(self):
+        self._slots.release()
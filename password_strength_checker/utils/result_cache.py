@@ -0,0 +1,143 @@
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Optional
+
+from .digest import DIGEST_KEY_ENV, keyed_digest
+
+logger = logging.getLogger(__name__)
+
+REDIS_URL_ENV = "REDIS_URL"
+
+# Bump when the shape or meaning of cached results changes
+CACHE_VERSION = "v1"
+
+# A cache lookup must never hold up analysis for long
+REDIS_TIMEOUT = 0.25
+
+# After a Redis error the cache is skipped for this many seconds, so an
+# outage costs one timeout per worker rather than one per lookup
+RETRY_AFTER = 5.0
+
+
+def _client_errors() -> tuple:
+    try:
+        from redis.exceptions import RedisError
+    except ImportError:
+        return (ConnectionError, TimeoutError)
+    return (RedisError, ConnectionError, TimeoutError)
+
+
+class ResultCache:
+    """Analysis results keyed by an HMAC digest of the password
+
+    With a Redis-compatible client (redis.Redis, fakeredis.FakeRedis) the
+    cache is shared by every worker and node; without one it falls back to
+    a bounded in-process LRU. The plaintext is never used as a key. When
+    Redis is unreachable, lookups miss and stores are dropped, so callers
+    simply compute the result; after an error Redis is not tried again for
+    `retry_after` seconds. Redis calls block, so async callers should run
+    them in a thread (see `blocking`).
+    """
+
+    def __init__(self, client=None, ttl: int = 3600, max_local: int = 4096,
+                 namespace: str = "default", retry_after: float = RETRY_AFTER):
+        self.client = client
+        self.ttl = ttl
+        self.retry_after = retry_after
+        self.max_local = max_local
+        self.prefix = f"pass-checker:analysis:{CACHE_VERSION}:{namespace}:"
+        self._local: "OrderedDict[str, Dict]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._errors = _client_errors()
+        self._degraded = False
+        self._retry_at = 0.0
+
+    @classmethod
+    def from_env(cls, **kwargs) -> "ResultCache":
+        """Use Redis when REDIS_URL is set, the in-process LRU otherwise"""
+        url = os.environ.get(REDIS_URL_ENV)
+        if not url:
+            return cls(**kwargs)
+        if not os.environ.get(DIGEST_KEY_ENV):
+            # Every worker would digest with its own random key and never hit
+            raise RuntimeError(f"{REDIS_URL_ENV} is set but {DIGEST_KEY_ENV} is not; "
+                               f"set the same {DIGEST_KEY_ENV} on every worker and node")
+        import redis
+        from redis.backoff import NoBackoff
+        from redis.retry import Retry
+        # redis-py retries with backoff by default, which turns one timeout
+        # into seconds; a miss is cheaper than waiting
+        client = redis.Redis.from_url(url, socket_timeout=REDIS_TIMEOUT,
+                                      socket_connect_timeout=REDIS_TIMEOUT,
+                                      retry=Retry(NoBackoff(), 0))
+        return cls(client=client, **kwargs)
+
+    @property
+    def blocking(self) -> bool:
+        """Whether get/set may wait on the network"""
+        return self.client is not None
+
+    def _client_skipped(self) -> bool:
+        return self._degraded and time.monotonic() < self._retry_at
+
+    def _client_failed(self, error: Exception):
+        self._retry_at = time.monotonic() + self.retry_after
+        if not self._degraded:
+            logger.warning("Result cache unavailable, analyzing without it: %s", error)
+            self._degraded = True
+
+    def _client_ok(self):
+        if self._degraded:
+            logger.warning("Result cache reachable again")
+            self._degraded = False
+        self._retry_at = 0.0
+
+    def _key(self, password: str) -> str:
+        return self.prefix + keyed_digest(password).hex()
+
+    def get(self, password: str) -> Optional[Dict]:
+        key = self._key(password)
+        if self.client is not None:
+            if self._client_skipped():
+                return None
+            try:
+                raw = self.client.get(key)
+            except self._errors as e:
+                self._client_failed(e)
+                return None
+            self._client_ok()
+            return json.loads(raw) if raw is not None else None
+        with self._lock:
+            result = self._local.get(key)
+            if result is not None:
+                self._local.move_to_end(key)
+            return result
+
+    def set(self, password: str, result: Dict):
+        key = self._key(password)
+        if self.client is not None:
+            if self._client_skipped():
+                return
+            try:
+                self.client.set(key, json.dumps(result), ex=self.ttl)
+            except self._errors as e:
+                self._client_failed(e)
+                return
+            self._client_ok()
+            return
+        with self._lock:
+            self._local[key] = result
+            self._local.move_to_end(key)
+            if len(self._local) > self.max_local:
+                self._local.popitem(last=False)
+
+    def get_or_compute(self, password: str, compute: Callable[[str], Dict]) -> Dict:
+        result = self.get(password)
+        if result is None:
+            result = compute(password)
+            self.set(password, result)
+        return result
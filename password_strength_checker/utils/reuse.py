@@ -0,0 +1,190 @@
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from .digest import keyed_digest
+
+# Counters only need to tell "seen once" from "seen at threshold times", so
+# they are single bytes that saturate instead of wrapping around
+_COUNTER_MAX = 255
+
+# Sketch counters per expected row in each row of the sketch. At 4 the
+# chance that a password seen once shares all 4 counters with others (a
+# false flag) is about 0.2%; memory is depth * width bytes.
+COUNTERS_PER_ROW = 4
+
+# Width cap: 64 MiB per row, 256 MiB at depth 4. Beyond about 16M rows the
+# sketch gets denser and flags more unique passwords, which verify() drops
+# (see ReuseDetector.max_tracked).
+MAX_SKETCH_WIDTH = 2 ** 26
+
+# Passwords counted exactly by verify(). An entry with a full account sample
+# (max_accounts=20) takes about 1.5 KB, so the default stays under 100 MB.
+MAX_TRACKED = 50_000
+
+
+def sketch_width(expected_rows: int, counters_per_row: int = COUNTERS_PER_ROW) -> int:
+    """Power-of-two sketch width for an audit of `expected_rows` rows, capped"""
+    width = 1024
+    while width < expected_rows * counters_per_row and width < MAX_SKETCH_WIDTH:
+        width *= 2
+    return width
+
+
+class CountMinSketch:
+    """Fixed-memory frequency estimates for HMAC digests
+
+    Digests are already uniformly distributed, so each row's index is just
+    a different 4-byte slice of the digest rather than a separate hash.
+    Conservative update (only raising the rows at the current minimum)
+    keeps over-estimation low. An estimate is never below the true count.
+    Memory is width * depth bytes.
+    """
+
+    def __init__(self, width: int = 2 ** 22, depth: int = 4):
+        if not 1 <= depth <= 8:
+            raise ValueError("depth must be between 1 and 8 for 32-byte digests")
+        self.width = width
+        self.depth = depth
+        self._rows = [bytearray(width) for _ in range(depth)]
+
+    def _indexes(self, digest: bytes) -> List[int]:
+        return [
+            int.from_bytes(digest[4 * row:4 * row + 4], "little") % self.width
+            for row in range(self.depth)
+        ]
+
+    def add(self, digest: bytes) -> int:
+        """Count one occurrence and return the new estimate"""
+        indexes = self._indexes(digest)
+        rows = self._rows
+        estimate = min(rows[row][index] for row, index in enumerate(indexes)) + 1
+        if estimate > _COUNTER_MAX:
+            return _COUNTER_MAX
+        for row, index in enumerate(indexes):
+            if rows[row][index] < estimate:
+                rows[row][index] = estimate
+        return estimate
+
+    def estimate(self, digest: bytes) -> int:
+        return min(self._rows[row][index] for row, index in enumerate(self._indexes(digest)))
+
+
+class ReuseDetector:
+    """Two-pass password reuse detection in bounded memory
+
+    Every password is reduced to a keyed HMAC digest. The first pass only
+    counts digests in a count-min sketch sized from `expected_rows` (and
+    capped at MAX_SKETCH_WIDTH). The second pass (`verify()`) re-reads the
+    same rows and counts exactly the digests the sketch flagged as seen at
+    least `threshold` times, for at most `max_tracked` of them.
+
+    When more are flagged, the lowest count that is still tracked
+    (`floor`) is raised and digests whose estimate is below it are
+    dropped. Estimates never undercount, so every password seen at least
+    `floor` times is still tracked and counted exactly. Rows of dropped
+    digests, some of them reused fewer than `floor` times, are reported as
+    `untracked_rows`. Memory is the sketch (depth * width bytes) plus at
+    most `max_tracked` entries (more only if that many passwords are each
+    shared 255+ times, the counter limit).
+    """
+
+    def __init__(self, key: bytes = b"", threshold: int = 2, expected_rows: int = 10 ** 6,
+                 max_accounts: int = 20, width: Optional[int] = None, depth: int = 4,
+                 max_tracked: int = MAX_TRACKED):
+        if not 2 <= threshold <= _COUNTER_MAX:
+            raise ValueError(f"threshold must be between 2 and {_COUNTER_MAX}")
+        self.key = key
+        self.threshold = threshold
+        self.max_accounts = max_accounts
+        self.max_tracked = max_tracked
+        self.sketch = CountMinSketch(width or sketch_width(expected_rows), depth)
+        self.total = 0
+        self.verified = False
+        self.floor = threshold
+        self.untracked_rows = 0
+        # digest -> [count, account sample, sketch estimate], filled by verify()
+        self._table: Dict[bytes, List] = {}
+
+    def digest(self, password: str) -> bytes:
+        return keyed_digest(password, self.key)
+
+    def add(self, password: str) -> bytes:
+        """Count one password in the first pass and return its digest"""
+        digest = self.digest(password)
+        self.add_digest(digest)
+        return digest
+
+    def add_digest(self, digest: bytes):
+        self.total += 1
+        self.sketch.add(digest)
+
+    def _raise_floor(self, counts: Dict[bytes, List]) -> int:
+        """Drop the digests with the lowest estimates until 3/4 of the table is left"""
+        by_estimate: Dict[int, int] = {}
+        for entry in counts.values():
+            by_estimate[entry[2]] = by_estimate.get(entry[2], 0) + 1
+        remaining = len(counts)
+        floor = self.floor
+        while remaining > self.max_tracked * 3 // 4 and floor < _COUNTER_MAX:
+            remaining -= by_estimate.get(floor, 0)
+            floor += 1
+        dropped = [digest for digest, entry in counts.items() if entry[2] < floor]
+        for digest in dropped:
+            self.untracked_rows += counts.pop(digest)[0]
+        self.floor = floor
+        return floor
+
+    def verify(self, rows: Iterable[Tuple[str, str]]):
+        """Second pass over the same rows: exact counts for the flagged digests"""
+        counts: Dict[bytes, List] = {}
+        self.floor = floor = self.threshold
+        self.untracked_rows = 0
+        for account, password in rows:
+            digest = self.digest(password)
+            entry = counts.get(digest)
+            if entry is None:
+                estimate = self.sketch.estimate(digest)
+                if estimate < self.threshold:
+                    continue
+                if estimate >= floor and len(counts) >= self.max_tracked and floor < _COUNTER_MAX:
+                    floor = self._raise_floor(counts)
+                if estimate < floor:
+                    self.untracked_rows += 1
+                    continue
+                entry = counts[digest] = [0, [], estimate]
+            entry[0] += 1
+            if len(entry[1]) < self.max_accounts:
+                entry[1].append(account)
+        self._table = {digest: entry for digest, entry in counts.items() if entry[0] >= self.threshold}
+        self.verified = True
+
+    def clusters(self, limit: Optional[int] = None) -> List[Dict]:
+        """Reused passwords, most shared first"""
+        if not self.verified:
+            raise RuntimeError("verify() must run over the same rows before reporting")
+        ordered = sorted(self._table.items(), key=lambda item: item[1][0], reverse=True)
+        return [
+            {
+                "digest": digest.hex(),
+                "count": count,
+                "frequency": count / self.total if self.total else 0.0,
+                "accounts": accounts,
+            }
+            for digest, (count, accounts, _) in ordered[:limit]
+        ]
+
+    def report(self, limit: Optional[int] = None) -> Dict:
+        """Reuse totals and the `limit` largest clusters
+
+        Totals cover every tracked password. If the table overflowed,
+        `complete_from` is above `threshold`: passwords shared fewer times
+        than that may be missing, and their rows are in `untracked_rows`.
+        """
+        clusters = self.clusters(limit)
+        return {
+            "rows": self.total,
+            "reused_passwords": len(self._table),
+            "accounts_sharing": sum(entry[0] for entry in self._table.values()),
+            "complete_from": self.floor,
+            "untracked_rows": self.untracked_rows,
+            "clusters": clusters,
+        }
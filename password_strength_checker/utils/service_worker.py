@@ -0,0 +1,134 @@
+import argparse
+import hashlib
+import json
+import os
+import re
+import tempfile
+import zipfile
+from typing import List
+
+from reflex import constants
+
+# Paths relative to the project root (where rxconfig.py lives)
+TEMPLATE_PATH = os.path.join("assets", "sw.js")
+# `reflex export` builds the frontend with Vite into this directory
+STATIC_DIR = os.path.join(constants.Dirs.WEB, constants.Dirs.STATIC)
+# Written by `reflex export --frontend-only` unless --no-zip is given
+FRONTEND_ZIP = "frontend.zip"
+
+# Files worth precaching; the export also writes .gz/.br/.zst sidecars and
+# source maps, which are skipped
+ASSET_EXTENSIONS = (".css", ".js", ".json", ".woff2", ".png", ".svg", ".ico")
+
+
+def collect_precache_urls(static_dir: str) -> List[str]:
+    """Collect the hashed bundles and public assets of an exported build"""
+    if not os.path.isdir(static_dir):
+        raise FileNotFoundError(f"{static_dir} does not exist; run `reflex export --frontend-only` first")
+
+    urls = {"/"}
+    for root, _, names in os.walk(static_dir):
+        for name in names:
+            if name == "sw.js" or not name.endswith(ASSET_EXTENSIONS):
+                continue
+            relative = os.path.relpath(os.path.join(root, name), static_dir)
+            urls.add("/" + relative.replace(os.sep, "/"))
+
+    return sorted(urls)
+
+
+def cache_version(urls: List[str], static_dir: str) -> str:
+    """Derive the cache version from the precached URLs and their contents"""
+    digest = hashlib.sha256()
+    for url in urls:
+        digest.update(url.encode("utf-8"))
+        path = os.path.join(static_dir, url.lstrip("/"))
+        if os.path.isfile(path):
+            with open(path, "rb") as f:
+                digest.update(hashlib.sha256(f.read()).digest())
+    return digest.hexdigest()[:12]
+
+
+def render_service_worker(template: str, urls: List[str], version: str) -> str:
+    """Fill the version and precache list into the sw.js template"""
+    url_lines = ",\n".join(f"  {json.dumps(url)}" for url in urls)
+    rendered = re.sub(
+        r"^const CACHE_VERSION = .*?;$",
+        f"const CACHE_VERSION = {json.dumps(version)};",
+        template,
+        count=1,
+        flags=re.MULTILINE
+    )
+    return re.sub(
+        r"^const PRECACHE_URLS = \[.*?\];$",
+        lambda _: f"const PRECACHE_URLS = [\n{url_lines}\n];",
+        rendered,
+        count=1,
+        flags=re.MULTILINE | re.DOTALL
+    )
+
+
+def generate_service_worker(static_dir: str = STATIC_DIR,
+                            template_path: str = TEMPLATE_PATH,
+                            output_path: str = "") -> str:
+    """Write a service worker for the current build and return its path"""
+    urls = collect_precache_urls(static_dir)
+    version = cache_version(urls, static_dir)
+
+    with open(template_path, encoding="utf-8") as f:
+        template = f.read()
+
+    output_path = output_path or os.path.join(static_dir, "sw.js")
+    with open(output_path, "w", encoding="utf-8") as f:
+        f.write(render_service_worker(template, urls, version))
+    return output_path
+
+
+def update_zip(zip_path: str, service_worker_path: str) -> str:
+    """Replace the template sw.js inside an exported frontend archive
+
+    The export zips the static directory before this generator runs, so the
+    archive still holds the unrendered template. The new sw.js goes next to
+    index.html, wherever the archive roots the static files.
+    """
+    with zipfile.ZipFile(zip_path) as source:
+        names = source.namelist()
+        index = min((n for n in names if n.rsplit("/", 1)[-1] == "index.html"), key=len, default="")
+        target = index[:-len("index.html")] + "sw.js"
+
+        directory = os.path.dirname(os.path.abspath(zip_path))
+        fd, temp_path = tempfile.mkstemp(suffix=".zip", dir=directory)
+        os.close(fd)
+        try:
+            with zipfile.ZipFile(temp_path, "w", zipfile.ZIP_DEFLATED) as rebuilt:
+                for info in source.infolist():
+                    if info.filename != target:
+                        rebuilt.writestr(info, source.read(info))
+                rebuilt.write(service_worker_path, target)
+            os.replace(temp_path, zip_path)
+        except BaseException:
+            os.remove(temp_path)
+            raise
+    return target
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Generate sw.js for the exported Reflex build (run after `reflex export`)"
+    )
+    parser.add_argument("--static-dir", default=STATIC_DIR)
+    parser.add_argument("--template", default=TEMPLATE_PATH)
+    parser.add_argument("--output", default="")
+    parser.add_argument("--zip", default=FRONTEND_ZIP,
+                        help="exported archive to update as well, if it exists")
+    args = parser.parse_args()
+
+    path = generate_service_worker(args.static_dir, args.template, args.output)
+    print(f"Service worker written to {path}")
+    if args.zip and os.path.isfile(args.zip):
+        entry = update_zip(args.zip, path)
+        print(f"Service worker written to {args.zip}:{entry}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,16 @@
+import os
+
 import reflex as rx
 
+# Multi-worker / multi-node deployments: point REDIS_URL at a shared Redis so
+# session state and analysis results survive across backend processes, and
+# set PASS_CHECKER_DIGEST_KEY to the same secret on every node. With Redis,
+# the production backend starts 2 * CPUs + 1 workers; GRANIAN_WORKERS overrides it.
 config = rx.Config(
     app_name="password_strength_checker",
     frontend_port=5000,
     backend_port=9000,
-    env=rx.Env.DEV,
+    env=rx.Env.PROD if os.environ.get("PASS_CHECKER_ENV") == "prod" else rx.Env.DEV,
+    redis_url=os.environ.get("REDIS_URL"),
     disable_plugins=["reflex.plugins.sitemap.SitemapPlugin"]
-)
\ No newline at end of file
+)
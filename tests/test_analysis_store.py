@@ -0,0 +1,24 @@
+"""AnalysisStore only persists results under a stable digest key"""
+import pytest
+
+from password_strength_checker.utils.analysis_store import AnalysisStore
+from password_strength_checker.utils.digest import DIGEST_KEY_ENV
+
+
+def test_requires_a_stable_key(tmp_path, monkeypatch):
+    monkeypatch.delenv(DIGEST_KEY_ENV, raising=False)
+    with pytest.raises(RuntimeError, match=DIGEST_KEY_ENV):
+        AnalysisStore(str(tmp_path / "cache.db"))
+
+
+def test_reopened_store_hits(tmp_path, monkeypatch):
+    monkeypatch.setenv(DIGEST_KEY_ENV, "audit-key")
+    path = str(tmp_path / "cache.db")
+    store = AnalysisStore(path)
+    first = store.get_or_analyze("Tr0ub4dor&3")
+    store.close()
+
+    store = AnalysisStore(path)
+    assert store.get_or_analyze("Tr0ub4dor&3") == first
+    assert (store.hits, store.misses) == (1, 0)
+    store.close()
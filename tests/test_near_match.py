@@ -0,0 +1,60 @@
+"""NearMatchIndex matches variants by word length and survives save/load"""
+import json
+import os
+
+from password_strength_checker.utils.near_match import NearMatchIndex
+from password_strength_checker.utils.policy import DEFAULT_POLICY_PATH, CompiledPolicy
+
+WORDS = ["admin", "monkey", "password", "sunshine", "correcthorse"]
+PROBES = ["admit", "@dm1n", "admin!", "donkey", "passw0rd1", "pasword", "sunshien",
+          "correcthrose", "corecthorse1", "xorrecthors", "zzzzqqq"]
+
+
+def _lookups(index):
+    return {probe: index.lookup(probe) for probe in PROBES}
+
+
+def test_distance_grows_with_length():
+    found = _lookups(NearMatchIndex(WORDS, max_distance=2))
+    # Five letters allow no edits, only folding and affixes
+    assert found["admit"] is None
+    assert found["@dm1n"] == found["admin!"] == "admin"
+    assert found["donkey"] == "monkey"
+    assert found["pasword"] == found["passw0rd1"] == "password"
+    assert found["sunshien"] == "sunshine"
+    assert found["correcthrose"] == found["xorrecthors"] == "correcthorse"
+    assert found["zzzzqqq"] is None
+
+
+def test_max_distance_caps_long_words():
+    found = _lookups(NearMatchIndex(WORDS, max_distance=1))
+    assert found["correcthrose"] == "correcthorse"
+    assert found["xorrecthors"] is None
+
+
+def test_saved_index_matches(tmp_path):
+    index = NearMatchIndex(WORDS, max_distance=2)
+    path = str(tmp_path / "words.near")
+    index.save(path)
+    loaded = NearMatchIndex.load(path)
+    assert len(loaded) == len(index)
+    assert _lookups(loaded) == _lookups(index)
+
+
+def test_policy_shares_the_wordlist_index(tmp_path):
+    wordlist = tmp_path / "breached.txt"
+    wordlist.write_text("\n".join(WORDS) + "\n", encoding="utf-8")
+    with open(DEFAULT_POLICY_PATH, encoding="utf-8") as f:
+        config = json.load(f)
+    config["near_match"]["wordlist"] = "breached.txt"
+
+    first = CompiledPolicy(config, str(tmp_path))
+    first.build_near_index()
+    saved = [name for name in os.listdir(tmp_path) if name.endswith(".near1")]
+    assert len(saved) == 1
+
+    # A truncated file is rebuilt rather than trusted
+    (tmp_path / saved[0]).write_bytes(b"NEAR")
+    second = CompiledPolicy(config, str(tmp_path))
+    assert second.near_common("sunshien") == "sunshine"
+    assert NearMatchIndex.load(str(tmp_path / saved[0])).lookup("sunshien") == "sunshine"
@@ -0,0 +1,32 @@
+"""Admission limits come from the environment and IPs resist forgery"""
+import pytest
+
+from password_strength_checker.utils.rate_limit import LIMIT_ENV, AdmissionController, client_ip
+
+
+def test_forwarded_for_ignored_without_trusted_proxies():
+    assert client_ip("10.0.0.5", "1.2.3.4") == "10.0.0.5"
+
+
+def test_client_is_counted_from_the_right():
+    # The client forged the first entry; the one proxy appended the real peer
+    assert client_ip("10.0.0.5", "1.2.3.4, 203.0.113.7", trusted_proxies=1) == "203.0.113.7"
+    assert client_ip("10.0.0.5", "1.2.3.4, 203.0.113.7, 10.0.0.9", trusted_proxies=2) == "203.0.113.7"
+    assert client_ip("10.0.0.5", "203.0.113.7", trusted_proxies=3) == "203.0.113.7"
+    assert client_ip("10.0.0.5", "", trusted_proxies=1) == "10.0.0.5"
+
+
+def test_limits_from_env(monkeypatch):
+    monkeypatch.setenv(LIMIT_ENV["ip_rate"], "2.5")
+    monkeypatch.setenv(LIMIT_ENV["max_concurrent"], "3")
+    monkeypatch.setenv(LIMIT_ENV["trusted_proxies"], "1")
+    admission = AdmissionController.from_env()
+    assert admission.ips.rate == 2.5 and admission.sessions.rate == 5.0
+    assert admission.max_concurrent == 3 and admission.trusted_proxies == 1
+    assert [admission.try_acquire("tab", "ip") for _ in range(4)] == [True] * 3 + [False]
+
+
+def test_invalid_limit(monkeypatch):
+    monkeypatch.setenv(LIMIT_ENV["max_keys"], "lots")
+    with pytest.raises(RuntimeError):
+        AdmissionController.from_env()
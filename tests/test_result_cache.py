@@ -0,0 +1,118 @@
+"""ResultCache against fakeredis and the in-process fallback"""
+import pytest
+
+from password_strength_checker.utils.digest import DIGEST_KEY_ENV
+from password_strength_checker.utils.result_cache import REDIS_URL_ENV, ResultCache
+
+fakeredis = pytest.importorskip("fakeredis")
+
+RESULT = {"score": 72.5, "strength": "Strong", "feedback": ["Add numbers"]}
+
+
+@pytest.fixture
+def server():
+    return fakeredis.FakeServer()
+
+
+def test_redis_round_trip(server):
+    cache = ResultCache(client=fakeredis.FakeRedis(server=server))
+    assert cache.get("hunter2") is None
+    cache.set("hunter2", RESULT)
+    assert cache.get("hunter2") == RESULT
+
+
+def test_shared_between_clients(server):
+    ResultCache(client=fakeredis.FakeRedis(server=server)).set("hunter2", RESULT)
+    assert ResultCache(client=fakeredis.FakeRedis(server=server)).get("hunter2") == RESULT
+
+
+def test_keys_never_contain_the_password(server):
+    client = fakeredis.FakeRedis(server=server)
+    ResultCache(client=client).set("hunter2", RESULT)
+    keys = client.keys("*")
+    assert len(keys) == 1
+    assert b"hunter2" not in keys[0]
+
+
+def test_ttl(server):
+    client = fakeredis.FakeRedis(server=server)
+    cache = ResultCache(client=client, ttl=60)
+    cache.set("hunter2", RESULT)
+    (key,) = client.keys("*")
+    assert 0 < client.ttl(key) <= 60
+
+
+def test_namespaces_are_isolated(server):
+    client = fakeredis.FakeRedis(server=server)
+    ResultCache(client=client, namespace="policy-a").set("hunter2", RESULT)
+    assert ResultCache(client=client, namespace="policy-b").get("hunter2") is None
+    assert ResultCache(client=client, namespace="policy-a").get("hunter2") == RESULT
+
+
+def test_outage_is_a_miss(server):
+    cache = ResultCache(client=fakeredis.FakeRedis(server=server), retry_after=0)
+    cache.set("hunter2", RESULT)
+    server.connected = False
+    assert cache.get("hunter2") is None
+    cache.set("other", RESULT)
+    assert cache.get_or_compute("hunter2", lambda password: {"score": 1}) == {"score": 1}
+    server.connected = True
+    assert cache.get("hunter2") == RESULT
+
+
+def test_outage_skips_redis_for_a_while(server, monkeypatch):
+    client = fakeredis.FakeRedis(server=server)
+    cache = ResultCache(client=client, retry_after=5)
+    cache.set("hunter2", RESULT)
+    calls = []
+    original_get = client.get
+    monkeypatch.setattr(client, "get", lambda key: calls.append(key) or original_get(key))
+    clock = [1000.0]
+    monkeypatch.setattr("password_strength_checker.utils.result_cache.time.monotonic", lambda: clock[0])
+
+    server.connected = False
+    assert cache.get("hunter2") is None
+    server.connected = True
+    clock[0] += 4
+    assert cache.get("hunter2") is None
+    cache.set("other", RESULT)
+    assert len(calls) == 1
+    clock[0] += 2
+    assert cache.get("hunter2") == RESULT
+    assert len(calls) == 2
+
+
+def test_local_lru_eviction():
+    cache = ResultCache(max_local=2)
+    cache.set("a", {"score": 1})
+    cache.set("b", {"score": 2})
+    assert cache.get("a") == {"score": 1}
+    cache.set("c", {"score": 3})
+    assert cache.get("b") is None
+    assert cache.get("a") == {"score": 1}
+    assert cache.get("c") == {"score": 3}
+
+
+def test_get_or_compute_computes_once():
+    cache = ResultCache()
+    calls = []
+
+    def compute(password):
+        calls.append(password)
+        return RESULT
+
+    assert cache.get_or_compute("hunter2", compute) == RESULT
+    assert cache.get_or_compute("hunter2", compute) == RESULT
+    assert calls == ["hunter2"]
+
+
+def test_from_env_without_redis(monkeypatch):
+    monkeypatch.delenv(REDIS_URL_ENV, raising=False)
+    assert ResultCache.from_env().client is None
+
+
+def test_from_env_requires_a_shared_digest_key(monkeypatch):
+    monkeypatch.setenv(REDIS_URL_ENV, "redis://localhost:6379/0")
+    monkeypatch.delenv(DIGEST_KEY_ENV, raising=False)
+    with pytest.raises(RuntimeError, match=DIGEST_KEY_ENV):
+        ResultCache.from_env()
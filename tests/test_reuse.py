@@ -0,0 +1,62 @@
+"""ReuseDetector counts exactly within its memory bounds"""
+import random
+
+import pytest
+
+from password_strength_checker.utils.reuse import MAX_SKETCH_WIDTH, ReuseDetector, sketch_width
+
+
+def _rows(seed=7, unique=5000, shared=40):
+    rng = random.Random(seed)
+    rows = [(f"user{i}", f"unique-{i}") for i in range(unique)]
+    sizes = {}
+    for c in range(shared):
+        sizes[f"shared-{c}"] = size = rng.choice([2, 3, 5, 9, 30])
+        rows += [(f"shared{c}-{j}", f"shared-{c}") for j in range(size)]
+    rng.shuffle(rows)
+    return rows, sizes
+
+
+def _detect(rows, **kwargs):
+    detector = ReuseDetector(b"key", expected_rows=len(rows), **kwargs)
+    for _, password in rows:
+        detector.add(password)
+    detector.verify(rows)
+    return detector
+
+
+def test_exact_clusters():
+    rows, sizes = _rows()
+    detector = _detect(rows)
+    report = detector.report(limit=5)
+    assert report["reused_passwords"] == len(sizes)
+    assert report["accounts_sharing"] == sum(sizes.values())
+    assert report["complete_from"] == 2 and report["untracked_rows"] == 0
+    assert len(report["clusters"]) == 5
+    assert report["clusters"][0]["count"] == max(sizes.values())
+
+
+def test_overflow_keeps_the_most_shared_exact():
+    rows, sizes = _rows()
+    # A saturated sketch flags most unique passwords as candidates
+    detector = _detect(rows, width=256, max_tracked=50)
+    report = detector.report()
+    floor = report["complete_from"]
+    assert floor > 2 and report["untracked_rows"] > 0
+    counts = {cluster["digest"]: cluster["count"] for cluster in report["clusters"]}
+    for password, size in sizes.items():
+        if size >= floor:
+            assert counts[detector.digest(password).hex()] == size
+    assert set(counts) <= {detector.digest(password).hex() for password in sizes}
+
+
+def test_sketch_width_is_capped():
+    assert sketch_width(1000) == 4096
+    assert sketch_width(10 ** 9) == MAX_SKETCH_WIDTH
+
+
+def test_report_requires_verify():
+    detector = ReuseDetector(b"key", expected_rows=10)
+    detector.add("hunter2")
+    with pytest.raises(RuntimeError):
+        detector.report()
@@ -0,0 +1,128 @@
+"""assets/scorer.js must agree with PasswordAnalyzer.analyze_quick"""
+import json
+import os
+import random
+import shutil
+import subprocess
+
+import pytest
+
+from benchmarks.corpus import SyntheticCorpus
+from password_strength_checker.utils.password_analyzer import PasswordAnalyzer
+from password_strength_checker.utils.policy import DEFAULT_POLICY_PATH, CompiledPolicy, load_policy
+
+NODE = shutil.which("node")
+SCORER = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "assets", "scorer.js")
+
+pytestmark = pytest.mark.skipif(NODE is None, reason="node is not installed")
+
+# Loads scorer.js the way the page does: policy first, then the script
+_RUNNER = """
+global.document = { addEventListener() {} };
+global.window = {};
+const input = JSON.parse(require('fs').readFileSync(0, 'utf8'));
+window.PASS_CHECKER_POLICY = input.policy;
+require(input.scorer);
+const results = input.passwords.map(function (password) {
+  const r = window.PassCheckerScorer.analyzeQuick(password);
+  return [r.score, r.strength, Math.round(r.entropy * 1e6) / 1e6, r.patterns.issues];
+});
+process.stdout.write(JSON.stringify(results));
+"""
+
+# ASCII, cased and caseless scripts, combining marks and astral characters
+_ALPHABET = "aaabcxyzABCXYZ0123!@#-_ éжЖK٣中文字ÄößΣςſ😀"
+
+
+def _corpus(seed: int, size: int):
+    rng = random.Random(seed)
+    mixed = [
+        "".join(rng.choice(_ALPHABET) for _ in range(rng.randint(1, 16)))
+        for _ in range(size)
+    ]
+    return mixed + SyntheticCorpus(seed).take(size)
+
+
+def _mismatches(policy: CompiledPolicy, passwords):
+    analyzer = PasswordAnalyzer(policy)
+    expected = [
+        [r["score"], r["strength"], round(r["entropy"], 6), r["patterns"]["issues"]]
+        for r in map(analyzer.analyze_quick, passwords)
+    ]
+    payload = {"policy": policy.client_config(), "scorer": SCORER, "passwords": passwords}
+    completed = subprocess.run(
+        [NODE, "-e", _RUNNER], input=json.dumps(payload),
+        capture_output=True, text=True, check=True, encoding="utf-8"
+    )
+    actual = json.loads(completed.stdout)
+    return [(p, js, py) for p, js, py in zip(passwords, actual, expected) if js != py]
+
+
+def test_default_policy_parity():
+    assert _mismatches(load_policy(DEFAULT_POLICY_PATH), _corpus(3, 2000)) == []
+
+
+def test_custom_policy_parity():
+    with open(DEFAULT_POLICY_PATH, encoding="utf-8") as f:
+        config = json.load(f)
+    config["weights"] = {"basic": 0.5, "zxcvbn": 0.2, "patterns": 0.3}
+    config["strength_labels"] = [
+        {"min_score": 70, "label": "Good"}, {"min_score": 0, "label": "Bad"}
+    ]
+    config["special_characters"] = "!-_a"
+    config["common_passwords"]["values"] += ["dragon", "sunshine"]
+    config["near_match"]["max_distance"] = 2
+    config["patterns"] += [
+        {"issue": "Year", "regex": "(19|20)\\d\\d", "penalty": 10},
+        {"issue": "Keyboard", "regex": "qwe|asd", "ignore_case": True, "penalty": 5},
+    ]
+    assert _mismatches(CompiledPolicy(config), _corpus(5, 2000)) == []
+
+
+# Replays keystrokes and server results against stub elements
+_SETTLE_RUNNER = """
+const elements = {};
+let onInput = null;
+global.document = {
+  addEventListener(type, listener) { onInput = listener; },
+  getElementById(id) { return elements[id] || null; },
+};
+global.window = {};
+const input = JSON.parse(require('fs').readFileSync(0, 'utf8'));
+window.PASS_CHECKER_POLICY = input.policy;
+require(input.scorer);
+elements[input.inputId] = { id: input.inputId, value: '' };
+elements[input.estimateId] = { textContent: '' };
+const shown = input.steps.map(function (step) {
+  if (step.type === 'type') {
+    elements[input.inputId].value = step.value;
+    onInput({ target: elements[input.inputId] });
+  } else if (step.type === 'set') {
+    elements[input.inputId].value = step.value;
+  } else {
+    window.PassCheckerScorer.settle(step.length);
+  }
+  return elements[input.estimateId].textContent !== '';
+});
+process.stdout.write(JSON.stringify(shown));
+"""
+
+
+def test_estimate_settles_on_server_result():
+    steps = [
+        {"type": "type", "value": "hunter"},
+        {"type": "settle", "length": 6},      # result for the current text
+        {"type": "type", "value": "hunter22"},
+        {"type": "settle", "length": 7},      # stale result, typing went on
+        {"type": "set", "value": "Zq7!vN0p"}, # generate_password's set_value
+        {"type": "settle", "length": 8},
+    ]
+    payload = {
+        "policy": load_policy(DEFAULT_POLICY_PATH).client_config(), "scorer": SCORER,
+        "inputId": "password-input", "estimateId": "instant-estimate", "steps": steps,
+    }
+    completed = subprocess.run(
+        [NODE, "-e", _SETTLE_RUNNER], input=json.dumps(payload),
+        capture_output=True, text=True, check=True, encoding="utf-8"
+    )
+    assert json.loads(completed.stdout) == [True, False, True, True, True, False]
@@ -0,0 +1,86 @@
+"""sw.js generation against the layout `reflex export` writes with Vite"""
+import os
+import re
+import zipfile
+
+import pytest
+
+pytest.importorskip("reflex")
+
+from password_strength_checker.utils.service_worker import (  # noqa: E402
+    STATIC_DIR, TEMPLATE_PATH, generate_service_worker, update_zip
+)
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# A trimmed .web/build/client: hashed bundles with compressed sidecars, the
+# copied public assets and the unrendered template
+BUILD_FILES = {
+    "index.html": "<html></html>",
+    "assets/root-B4x9kQ2d.js": "export default 1",
+    "assets/root-B4x9kQ2d.js.gz": "",
+    "assets/index-Cq1mZ0aL.css": "body{}",
+    "assets/index-Cq1mZ0aL.css.map": "{}",
+    "fonts/fonts.css": "@font-face{}",
+    "fonts/securepass-400-latin.woff2": "woff2",
+    "sw.js": "template",
+}
+
+
+@pytest.fixture
+def static_dir(tmp_path):
+    for relative, content in BUILD_FILES.items():
+        path = tmp_path / relative
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(content)
+    return str(tmp_path)
+
+
+def _precache_urls(path):
+    with open(path, encoding="utf-8") as f:
+        block = re.search(r"^const PRECACHE_URLS = \[(.*?)\];$", f.read(), re.MULTILINE | re.DOTALL)
+    return re.findall(r'"([^"]+)"', block.group(1))
+
+
+def test_static_dir_is_the_vite_output():
+    assert STATIC_DIR == os.path.join(".web", "build", "client")
+
+
+def test_precaches_hashed_bundles_and_public_assets(static_dir):
+    path = generate_service_worker(static_dir, os.path.join(ROOT, TEMPLATE_PATH))
+    assert path == os.path.join(static_dir, "sw.js")
+    assert _precache_urls(path) == [
+        "/",
+        "/assets/index-Cq1mZ0aL.css",
+        "/assets/root-B4x9kQ2d.js",
+        "/fonts/fonts.css",
+        "/fonts/securepass-400-latin.woff2",
+    ]
+
+
+def test_version_follows_content(static_dir):
+    template = os.path.join(ROOT, TEMPLATE_PATH)
+    version = re.compile(r'^const CACHE_VERSION = "(\w+)";$', re.MULTILINE)
+    with open(generate_service_worker(static_dir, template), encoding="utf-8") as f:
+        before = version.search(f.read()).group(1)
+    with open(os.path.join(static_dir, "assets", "root-B4x9kQ2d.js"), "w") as f:
+        f.write("export default 2")
+    with open(generate_service_worker(static_dir, template), encoding="utf-8") as f:
+        assert version.search(f.read()).group(1) != before
+
+
+def test_missing_export(tmp_path):
+    with pytest.raises(FileNotFoundError, match="reflex export"):
+        generate_service_worker(str(tmp_path / "missing"), os.path.join(ROOT, TEMPLATE_PATH))
+
+
+def test_update_zip(static_dir, tmp_path):
+    archive = str(tmp_path / "frontend.zip")
+    with zipfile.ZipFile(archive, "w") as z:
+        for relative, content in BUILD_FILES.items():
+            z.writestr(relative, content)
+    path = generate_service_worker(static_dir, os.path.join(ROOT, TEMPLATE_PATH))
+    assert update_zip(archive, path) == "sw.js"
+    with zipfile.ZipFile(archive) as z, open(path, encoding="utf-8") as f:
+        assert z.read("sw.js").decode("utf-8") == f.read()
+        assert sorted(z.namelist()) == sorted(BUILD_FILES)